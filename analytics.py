@@ -0,0 +1,151 @@
+"""
+Analyses longue durée des jeux et des prédictions (NumPy).
+
+GameArchive garde les G et les résultats des prédictions sur des dizaines de
+milliers de jeux, dans des tableaux circulaires, au-delà du reset quotidien.
+Les analyses (séries, écarts par parité, fréquence des G, taux de réussite
+glissants) sont faites en passes vectorisées sur ces tableaux.
+"""
+
+import numpy as np
+
+
+class GameArchive:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._g_values = np.zeros(capacity, dtype=np.int16)
+        self._games = 0  # Nombre total de jeux ajoutés
+        self._outcomes = np.zeros(capacity, dtype=np.int8)  # 1 = gagnée, 0 = perdue
+        self._results = 0
+        self._last_game = -1
+
+    def __len__(self):
+        return min(self._games, self.capacity)
+
+    @property
+    def outcome_count(self) -> int:
+        return min(self._results, self.capacity)
+
+    def clear(self):
+        self._games = self._results = 0
+        self._last_game = -1
+
+    def new_session(self):
+        """Reset quotidien: les numéros de jeu repartent de zéro, l'archive est conservée."""
+        self._last_game = -1
+
+    def add_game(self, game_number: int, G_value: int):
+        """Ajoute un jeu; une édition du dernier jeu le remplace, un jeu plus ancien est ignoré."""
+        if game_number < self._last_game:
+            return
+        if game_number == self._last_game:
+            self._g_values[(self._games - 1) % self.capacity] = G_value
+            return
+        self._last_game = game_number
+        self._g_values[self._games % self.capacity] = G_value
+        self._games += 1
+
+    def add_outcome(self, won: bool):
+        self._outcomes[self._results % self.capacity] = won
+        self._results += 1
+
+    @staticmethod
+    def _chronological(values: np.ndarray, count: int, limit: int = None) -> np.ndarray:
+        capacity = len(values)
+        size = min(count, capacity)
+        if limit is not None:
+            size = min(size, limit)
+        end = count % capacity
+        if count <= capacity or end >= size:
+            return values[end - size:end] if end else values[capacity - size:]
+        return np.concatenate((values[capacity - (size - end):], values[:end]))
+
+    def g_values(self, limit: int = None) -> np.ndarray:
+        """Les G des `limit` derniers jeux (tous par défaut), du plus ancien au plus récent."""
+        return self._chronological(self._g_values, self._games, limit)
+
+    def outcomes(self, limit: int = None) -> np.ndarray:
+        return self._chronological(self._outcomes, self._results, limit)
+
+
+# --- Analyses ---
+
+def _histogram(values: np.ndarray) -> dict:
+    """{valeur: nombre} pour des entiers positifs."""
+    if not len(values):
+        return {}
+    counts = np.bincount(values)
+    present = np.flatnonzero(counts)
+    return {int(v): int(counts[v]) for v in present}
+
+
+def run_lengths(parities: np.ndarray) -> dict:
+    """
+    Histogramme des longueurs des séries terminées, par parité.
+    La série en cours (non terminée) est rapportée à part.
+    """
+    if not len(parities):
+        return {'even': {}, 'odd': {}, 'current': None}
+
+    starts = np.concatenate(([0], np.flatnonzero(parities[1:] != parities[:-1]) + 1))
+    lengths = np.diff(np.append(starts, len(parities)))
+    run_parities = parities[starts]
+
+    finished_lengths, finished_parities = lengths[:-1], run_parities[:-1]
+    return {
+        'even': _histogram(finished_lengths[finished_parities]),
+        'odd': _histogram(finished_lengths[~finished_parities]),
+        'current': {'parity': 'even' if run_parities[-1] else 'odd', 'length': int(lengths[-1])},
+    }
+
+
+def gap_distribution(parities: np.ndarray) -> dict:
+    """Écarts (en jeux) entre deux résultats consécutifs de même parité."""
+    return {
+        'even': _histogram(np.diff(np.flatnonzero(parities))),
+        'odd': _histogram(np.diff(np.flatnonzero(~parities))),
+    }
+
+
+def g_frequency(g_values: np.ndarray) -> dict:
+    return _histogram(g_values.astype(np.int64))
+
+
+def rolling_win_rate(outcomes: np.ndarray, window: int, points: int = 100) -> dict:
+    """
+    Taux de réussite glissant sur `window` prédictions (somme cumulée).
+    La série est sous-échantillonnée à `points` valeurs au plus.
+    """
+    if len(outcomes) < window or window <= 0:
+        return {'window': window, 'predictions': len(outcomes), 'current': None,
+                'min': None, 'max': None, 'series': []}
+
+    cumulative = np.cumsum(outcomes, dtype=np.int64)
+    sums = cumulative[window - 1:] - np.concatenate(([0], cumulative[:-window]))
+    rates = sums * (100.0 / window)
+    step = max(1, -(-len(rates) // points))
+    series = rates[::-1][::step][::-1]
+    return {
+        'window': window,
+        'predictions': len(outcomes),
+        'current': round(float(rates[-1]), 2),
+        'min': round(float(rates.min()), 2),
+        'max': round(float(rates.max()), 2),
+        'series': np.round(series, 2).tolist(),
+    }
+
+
+def analyse(archive: GameArchive, games: int = None, window: int = 50) -> dict:
+    """Toutes les analyses sur les `games` derniers jeux (toute l'archive par défaut)."""
+    g_values = archive.g_values(games)
+    parities = (g_values % 2) == 0
+    outcomes = archive.outcomes()
+    return {
+        'games': len(g_values),
+        'even': int(parities.sum()),
+        'odd': int(len(parities) - parities.sum()),
+        'runs': run_lengths(parities),
+        'gaps': gap_distribution(parities),
+        'g_frequency': g_frequency(g_values),
+        'win_rate': rolling_win_rate(outcomes, window),
+    }
@@ -0,0 +1,59 @@
+"""
+Écritures disque hors de la boucle asyncio.
+
+BackgroundWriter met les écritures en file; un thread dédié vide la file par
+lots (tout ce qui est arrivé depuis le lot précédent) et les confie à
+write_batch(). Utilisé par StateStore (journal d'état) et GameStore (SQLite).
+"""
+
+import logging
+import queue
+import threading
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWriter(ABC):
+    thread_name = 'background-writer'
+    error_message = "Erreur écriture"
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def put(self, kind: str, payload):
+        """Met une écriture en file (sans effet si le thread n'est pas démarré)."""
+        if self._thread is not None:
+            self._queue.put((kind, payload))
+
+    def open_writer(self):
+        """Appelé une fois dans le thread d'écriture, avant le premier lot."""
+
+    @abstractmethod
+    def write_batch(self, items: list):
+        """Écrit un lot de (kind, payload), dans l'ordre d'arrivée."""
+
+    def _run(self):
+        self.open_writer()
+        while True:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self.write_batch(items)
+            except Exception as e:
+                logger.error(f"{self.error_message}: {e}")
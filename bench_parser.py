@@ -0,0 +1,83 @@
+"""
+Micro-benchmark de l'analyse des messages du canal source.
+
+Compare l'analyse en une passe (source_parser) à l'ancienne analyse en trois
+appels séparés, sur un corpus des formats du canal source (⏰, ▶️, ✅, 🔰).
+
+Usage: python bench_parser.py [nombre_de_tours]
+"""
+
+import re
+import sys
+import timeit
+
+from source_parser import parse_source_message
+
+CORPUS = [
+    # En cours
+    "⏰#N1234. 0(K♠️Q♦️) - 0(J♥️10♣️)",
+    "#N1235. ⏰ 3(A♠️2♦️) - 5(J♥️5♣️)",
+    "▶️ #N1236. 7(4♠️3♦️) - 2(K♥️2♣️)",
+    "#N1237. ▶️6(6♠️K♦️) - 9(9♥️Q♣️)",
+    # Finalisés
+    "#N1238. ✅8(5♠️3♦️) - 6(A♥️5♣️)",
+    "#N1239. 4(2♠️2♦️) - ✅7(3♥️4♣️)",
+    "#N1240. ✅9(4♠️5♦️Q♣️) - 3(A♥️2♣️K♦️) #T12",
+    "#N1241. 5(2♠️3♦️) 🔰 5(K♥️5♣️)",
+    "#N 1242. ✅0(K♠️Q♦️J♣️) - 2(A♥️A♣️)",
+    "#N1243.✅6(6♠️)-1(A♦️)",
+    # Messages ignorés
+    "Résultats du jour",
+    "🎰 Nouvelle session dans 5 minutes",
+    "#T45 Total: 12",
+    "",
+]
+
+
+def legacy_parse(message: str):
+    """Ancienne analyse: deux regex non compilées et quatre recherches d'emoji."""
+    match = re.search(r"#N\s*(\d+)", message, re.IGNORECASE)
+    if not match:
+        return None
+    game_number = int(match.group(1))
+    match = re.search(r"#N\s*\d+[^\d]*?(\d+)", message)
+    G_value = int(match.group(1)) if match else None
+    if '✅' in message or '🔰' in message:
+        status = 'finalized'
+    elif '⏰' in message or '▶️' in message:
+        status = 'pending'
+    else:
+        status = 'unknown'
+    return game_number, G_value, status
+
+
+def check_corpus():
+    for message in CORPUS:
+        expected = legacy_parse(message)
+        got = parse_source_message(message)
+        if expected != got:
+            raise AssertionError(f"{message!r}: {got} != {expected}")
+
+
+def bench(func, rounds: int) -> float:
+    def run():
+        for message in CORPUS:
+            func(message)
+    seconds = min(timeit.repeat(run, number=rounds, repeat=5))
+    return rounds * len(CORPUS) / seconds
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    check_corpus()
+
+    legacy = bench(legacy_parse, rounds)
+    single_pass = bench(parse_source_message, rounds)
+
+    print(f"Corpus: {len(CORPUS)} messages x {rounds} tours")
+    print(f"Ancienne analyse : {legacy:>12,.0f} msg/s")
+    print(f"Analyse 1 passe  : {single_pass:>12,.0f} msg/s  (x{single_pass / legacy:.2f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Santé des canaux de prédiction et disjoncteur par canal.
+
+Chaque échec d'envoi ou d'édition est compté par canal. Après `threshold`
+échecs consécutifs le disjoncteur s'ouvre: le canal est ignoré jusqu'à la fin
+d'un délai qui double à chaque nouvel échec (borné par `max_backoff`). À
+l'échéance, un seul essai est autorisé (semi-ouvert): un succès referme le
+disjoncteur, un échec le rouvre pour un délai plus long.
+"""
+
+from time import monotonic
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class ChannelHealth:
+    __slots__ = ('failures', 'successes', 'open_until', 'backoff', 'trial', 'last_error')
+
+    def __init__(self):
+        self.failures = 0      # Échecs consécutifs
+        self.successes = 0
+        self.open_until = 0.0  # Instant (monotone) de fin d'ouverture, 0 = fermé
+        self.backoff = 0.0
+        self.trial = False     # Essai semi-ouvert en cours
+        self.last_error = None
+
+
+class ChannelBreaker:
+    def __init__(self, threshold: int = 3, base_backoff: float = 30.0, max_backoff: float = 3600.0):
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._channels = {}
+
+    def _health(self, channel_id: int) -> ChannelHealth:
+        health = self._channels.get(channel_id)
+        if health is None:
+            health = self._channels[channel_id] = ChannelHealth()
+        return health
+
+    def state(self, channel_id: int, now: float = None) -> str:
+        health = self._channels.get(channel_id)
+        if health is None or not health.open_until:
+            return CLOSED
+        now = monotonic() if now is None else now
+        return OPEN if now < health.open_until and not health.trial else HALF_OPEN
+
+    def allow(self, channel_id: int, now: float = None) -> bool:
+        """True si le canal peut être contacté (réserve l'essai en semi-ouvert)."""
+        health = self._channels.get(channel_id)
+        if health is None or not health.open_until:
+            return True
+        if health.trial:
+            return False
+        now = monotonic() if now is None else now
+        if now < health.open_until:
+            return False
+        health.trial = True
+        return True
+
+    def record_success(self, channel_id: int) -> bool:
+        """Retourne True si le disjoncteur vient de se refermer."""
+        health = self._health(channel_id)
+        was_open = bool(health.open_until)
+        health.failures = 0
+        health.successes += 1
+        health.open_until = 0.0
+        health.backoff = 0.0
+        health.trial = False
+        return was_open
+
+    def record_failure(self, channel_id: int, error=None, now: float = None) -> bool:
+        """Retourne True si le disjoncteur vient de s'ouvrir (ou de se rouvrir)."""
+        health = self._health(channel_id)
+        health.failures += 1
+        health.last_error = str(error)[:200] if error is not None else None
+        health.trial = False
+        if health.failures < self.threshold:
+            return False
+
+        if health.backoff:
+            health.backoff = min(health.backoff * 2, self.max_backoff)
+        else:
+            health.backoff = self.base_backoff
+        now = monotonic() if now is None else now
+        health.open_until = now + health.backoff
+        return True
+
+    def forget(self, channel_id: int):
+        self._channels.pop(channel_id, None)
+
+    def describe(self, channel_id: int, now: float = None) -> dict:
+        now = monotonic() if now is None else now
+        health = self._channels.get(channel_id)
+        if health is None:
+            return {'state': CLOSED, 'failures': 0, 'successes': 0, 'retry_in': 0, 'last_error': None}
+        return {
+            'state': self.state(channel_id, now),
+            'failures': health.failures,
+            'successes': health.successes,
+            'retry_in': round(max(health.open_until - now, 0), 1) if health.open_until else 0,
+            'last_error': health.last_error,
+        }
@@ -2,6 +2,8 @@
 Configuration du bot Telegram de prédiction Pair/Impair
 """
 
+import os
+
 # ============================================
 # IDENTIFIANTS TELEGRAM (ESSENTIELS)
 # ============================================
@@ -24,15 +26,47 @@ PREDICTION_CHANNEL_IDS = [
     # -1000987654321,  # Canal tertiaire (décommentez pour ajouter)
 ]
 
+# PLUSIEURS TABLES: canaux source suivis (le premier est la source principale)
+# Chaque canal source a son propre moteur (historique, séries, écarts, prédictions);
+# ses canaux de prédiction sont ajoutés par /addchannel (dynamic_channels.json)
+SOURCES = (
+    SOURCE_CHANNEL_ID,
+    # -1001111111111,  # Table secondaire (décommentez pour ajouter)
+)
+
 # ============================================
 # CONFIGURATION SERVEUR
 # ============================================
 
 PORT = 10000
 
+# Dossier des fichiers persistants (état, journal, canaux, base des jeux).
+# Sur Render, il doit être sur un disque persistant (voir render.yaml):
+# sans disque, le système de fichiers est effacé à chaque redéploiement.
+DATA_DIR = os.getenv('DATA_DIR', '.')
+
 # ============================================
 # PARAMÈTRES DE PRÉDICTION PAIR/IMPAIR
 # ============================================
 
 DEFAULT_AUTO_CHECK_INTERVAL = 20
 MAX_HISTORY_SIZE = 1000
+
+# Jeux et résultats gardés pour les analyses longue durée (/runs, /gaps, /gfreq, /winrate)
+ANALYTICS_HISTORY_SIZE = 50000
+
+# Nombre maximum d'envois simultanés vers les canaux de prédiction
+# (1 = envoi séquentiel, canal par canal)
+PREDICTION_SEND_CONCURRENCY = 10
+
+# Notifications admin regroupées: les notifications arrivées dans cette fenêtre
+# (en secondes) sont envoyées en un seul message (0 = une notification par message)
+ADMIN_DIGEST_SECONDS = 0
+ADMIN_DIGEST_MAX = 10
+
+# Disjoncteur par canal de prédiction: après CHANNEL_FAILURE_THRESHOLD échecs
+# consécutifs, le canal est ignoré pendant un délai (secondes) qui double à
+# chaque nouvel échec, jusqu'à CHANNEL_MAX_BACKOFF
+CHANNEL_FAILURE_THRESHOLD = 3
+CHANNEL_BASE_BACKOFF = 30
+CHANNEL_MAX_BACKOFF = 3600
@@ -0,0 +1,352 @@
+"""
+Moteur de prédiction d'un canal source.
+
+Chaque canal source (table) a son propre moteur: historique, séries, écarts,
+prédictions en cours, compteurs et règles (mode, seuils, fenêtre). Le moteur
+ne fait aucune entrée/sortie; l'envoi des prédictions, le journal d'état et
+les notifications restent dans main.py.
+"""
+
+import logging
+from collections import OrderedDict
+
+from analytics import GameArchive
+from gap_window import GapWindow
+from game_history import GameHistory
+from strategies import StrategyBank, default_strategies
+
+logger = logging.getLogger(__name__)
+
+# Règles par défaut d'un nouveau moteur
+PREDICTION_WINDOW = 3
+PREDICTION_TARGET_OFFSET = 2  # Jeu visé = dernier jeu + offset
+AUTO_GAP_MIN = 2
+AUTO_GAP_MAX = 8
+GAMES_FOR_ANALYSIS = 20
+DEFAULT_GAP = 3
+ARCHIVE_SIZE = 50000
+
+# Jeux en cours (non finalisés) gardés au plus, et leur âge maximal en secondes
+PENDING_GAMES_MAX = 100
+PENDING_GAMES_MAX_AGE = 1800
+# Messages source récents (identifiant, contenu) mémorisés pour ignorer les doublons
+RECENT_MESSAGES_MAX = 512
+
+
+class SourceEngine:
+    __slots__ = (
+        'source_id', 'channels',
+        # Jeux
+        'history', 'pending_finalization', 'last_game_number', 'last_G_value',
+        'recent_messages',  # LRU des empreintes de messages déjà traités
+        'archive',  # Historique long pour les analyses, conservé au reset quotidien
+        'total_even_count', 'total_odd_count',
+        # Séries et écarts
+        'current_even_streak', 'current_odd_streak', 'streak_last_game',
+        'gap_window', 'gap_window_last_game', 'initial_analysis_done',
+        # Règles
+        'auto_mode', 'manual_even_gap', 'manual_odd_gap', 'auto_even_gap', 'auto_odd_gap',
+        'games_for_analysis', 'auto_gap_min', 'auto_gap_max',
+        'prediction_window', 'target_offset',
+        # Stratégies: registres fantômes et stratégie publiée (None = règle des seuils)
+        'shadow', 'strategy',
+        # Prédictions
+        'pending_predictions', 'predictions_by_game', 'active_prediction_count',
+        'total_predictions_made', 'total_predictions_won', 'total_predictions_lost',
+        # Canal source
+        'last_source_message_id', 'source_entity',
+    )
+
+    # Champs scalaires sauvegardés dans le journal d'état
+    STATE_FIELDS = (
+        'total_even_count', 'total_odd_count',
+        'total_predictions_made', 'total_predictions_won', 'total_predictions_lost',
+        'last_game_number', 'last_G_value', 'auto_mode',
+        'manual_even_gap', 'manual_odd_gap', 'auto_even_gap', 'auto_odd_gap',
+        'initial_analysis_done', 'last_source_message_id', 'strategy',
+    )
+
+    def __init__(self, source_id: int, channels: list = (), history_size: int = 1000,
+                 archive_size: int = ARCHIVE_SIZE):
+        self.source_id = source_id
+        self.channels = list(channels)
+
+        self.history = GameHistory(history_size)
+        self.archive = GameArchive(archive_size)
+        self.pending_finalization = OrderedDict()  # jeu -> jeu en cours, du plus ancien au plus récent
+        self.recent_messages = OrderedDict()
+        self.pending_predictions = {}
+        # Index des prédictions actives: jeu -> prédictions dont la fenêtre couvre ce jeu
+        self.predictions_by_game = {}
+
+        self.auto_mode = True
+        self.manual_even_gap = self.manual_odd_gap = DEFAULT_GAP
+        self.auto_even_gap = self.auto_odd_gap = DEFAULT_GAP
+        self.games_for_analysis = GAMES_FOR_ANALYSIS
+        self.auto_gap_min = AUTO_GAP_MIN
+        self.auto_gap_max = AUTO_GAP_MAX
+        self.prediction_window = PREDICTION_WINDOW
+        self.target_offset = PREDICTION_TARGET_OFFSET
+
+        self.gap_window = GapWindow(self.games_for_analysis)
+        self.shadow = StrategyBank(default_strategies())
+        self.strategy = None
+        self.last_source_message_id = 0  # Dernier message du canal source traité
+        self.source_entity = None  # Entité d'entrée du canal source, résolue au démarrage
+        self.reset()
+
+    def reset(self):
+        """Efface les jeux, prédictions et compteurs (les règles et l'archive sont conservées)."""
+        self.history.clear()
+        self.archive.new_session()
+        self.pending_finalization.clear()
+        self.pending_predictions.clear()
+        self.predictions_by_game.clear()
+        self.active_prediction_count = 0
+        self.current_even_streak = self.current_odd_streak = 0
+        self.streak_last_game = 0
+        self.gap_window.clear()
+        self.gap_window_last_game = 0
+        self.total_even_count = self.total_odd_count = 0
+        self.total_predictions_made = self.total_predictions_won = self.total_predictions_lost = 0
+        self.last_game_number = self.last_G_value = 0
+        self.initial_analysis_done = False
+        self.shadow.reset()
+
+    # --- Persistance ---
+
+    def state_fields(self) -> dict:
+        return {name: getattr(self, name) for name in self.STATE_FIELDS}
+
+    def apply_state_fields(self, state: dict):
+        for name, value in state.items():
+            if name in self.STATE_FIELDS:
+                setattr(self, name, value)
+
+    # --- Analyse des Écarts ---
+
+    def calculate_gap_stats_from_window(self) -> bool:
+        if not self.auto_mode:
+            logger.info(f"👤 [{self.source_id}] Mode manuel actif - Pas de recalcul auto des écarts")
+            return False
+
+        if len(self.gap_window) < self.games_for_analysis:
+            return False
+
+        old_even_gap = self.auto_even_gap
+        old_odd_gap = self.auto_odd_gap
+
+        even_max = self.gap_window.max_even_gap
+        odd_max = self.gap_window.max_odd_gap
+
+        if even_max is not None:
+            self.auto_even_gap = max(self.auto_gap_min, min(even_max, self.auto_gap_max))
+
+        if odd_max is not None:
+            self.auto_odd_gap = max(self.auto_gap_min, min(odd_max, self.auto_gap_max))
+
+        self.initial_analysis_done = True
+
+        if old_even_gap != self.auto_even_gap or old_odd_gap != self.auto_odd_gap:
+            logger.info(f"📊 [{self.source_id}] Écarts AUTO mis à jour - "
+                        f"P:{old_even_gap}→{self.auto_even_gap}, I:{old_odd_gap}→{self.auto_odd_gap}")
+
+        return True
+
+    def set_games_for_analysis(self, size: int):
+        self.games_for_analysis = size
+        self.gap_window.size = size
+        self.rebuild_gap_window()
+
+    def rebuild_gap_window(self):
+        """Reconstruit la fenêtre des écarts depuis l'historique (jeux hors ordre, éditions)."""
+        recent_games = self.history.last(self.games_for_analysis)
+        self.gap_window.rebuild(is_even_result for _, _, is_even_result in recent_games)
+        self.gap_window_last_game = recent_games[-1][0] if recent_games else 0
+
+    def update_gap_window(self, game_number: int, is_even_result: bool, replaced: bool = False):
+        """Ajoute un nouveau jeu à la fenêtre des écarts en O(1), sinon la reconstruit."""
+        if replaced or game_number <= self.gap_window_last_game:
+            self.rebuild_gap_window()
+            return
+
+        self.gap_window.push(is_even_result)
+        self.gap_window_last_game = game_number
+
+    # --- Séries ---
+
+    def calculate_current_streaks(self):
+        """
+        Recalcule entièrement les séries depuis l'historique.
+        Utilisé uniquement pour les jeux hors ordre et les éditions (voir update_streaks).
+        """
+        even_streak = odd_streak = 0
+        self.streak_last_game = 0
+
+        if self.history:
+            self.streak_last_game = self.history.last_game
+
+            for _, _, is_even_result in self.history.iter_games(reverse=True):
+                if even_streak == 0 and odd_streak == 0:
+                    if is_even_result:
+                        even_streak = 1
+                    else:
+                        odd_streak = 1
+                elif is_even_result and odd_streak == 0:
+                    even_streak += 1
+                elif not is_even_result and even_streak == 0:
+                    odd_streak += 1
+                else:
+                    break
+
+        self.current_even_streak = even_streak
+        self.current_odd_streak = odd_streak
+
+    def update_streaks(self, game_number: int, is_even_result: bool, replaced: bool = False):
+        """
+        Met à jour les séries en O(1) pour un nouveau jeu.
+        Un jeu hors ordre ou une édition d'un jeu déjà enregistré déclenche un recalcul complet.
+        """
+        if replaced or game_number <= self.streak_last_game:
+            self.calculate_current_streaks()
+            return
+
+        if is_even_result:
+            self.current_even_streak = self.current_even_streak + 1 if self.current_odd_streak == 0 else 1
+            self.current_odd_streak = 0
+        else:
+            self.current_odd_streak = self.current_odd_streak + 1 if self.current_even_streak == 0 else 1
+            self.current_even_streak = 0
+
+        self.streak_last_game = game_number
+
+    # --- Messages source ---
+
+    def is_duplicate_message(self, message_id: int, message_text: str) -> bool:
+        """
+        Vrai si ce message a déjà été reçu avec ce contenu (nouvelle livraison ou
+        édition sans changement); sinon le mémorise (LRU de RECENT_MESSAGES_MAX).
+        """
+        key = hash((message_id, message_text))
+        recent = self.recent_messages
+        if key in recent:
+            recent.move_to_end(key)
+            return True
+        recent[key] = None
+        if len(recent) > RECENT_MESSAGES_MAX:
+            recent.popitem(last=False)
+        return False
+
+    def add_pending_game(self, game_number: int, G_value, now: float) -> int:
+        """
+        Mémorise un jeu en cours (now: instant monotone). Les jeux jamais finalisés
+        sont évincés, les plus anciens d'abord, au-delà de PENDING_GAMES_MAX ou
+        après PENDING_GAMES_MAX_AGE secondes. Retourne le nombre de jeux évincés.
+        """
+        pending = self.pending_finalization
+        pending[game_number] = {'received_at': now, 'G_value': G_value}
+        pending.move_to_end(game_number)
+
+        evicted = 0
+        while len(pending) > PENDING_GAMES_MAX:
+            pending.popitem(last=False)
+            evicted += 1
+        while now - next(iter(pending.values()))['received_at'] > PENDING_GAMES_MAX_AGE:
+            pending.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    # --- Jeux ---
+
+    def add_game(self, game_number: int, G_value: int, timestamp: float) -> tuple:
+        """
+        Enregistre un jeu finalisé: historique, compteurs, séries et fenêtre des écarts.
+        Retourne (parité de G, jeu conservé dans l'historique).
+        """
+        is_even_result = G_value % 2 == 0
+        replaced = game_number in self.history
+
+        if is_even_result:
+            self.total_even_count += 1
+        else:
+            self.total_odd_count += 1
+
+        stored = self.history.add(game_number, G_value, timestamp)
+        self.update_streaks(game_number, is_even_result, replaced)
+        self.update_gap_window(game_number, is_even_result, replaced)
+        self.shadow.observe(game_number, is_even_result, self.prediction_window, self.target_offset)
+        self.archive.add_game(game_number, G_value)
+        return is_even_result, stored
+
+    def prime_from_history(self):
+        """
+        Rejoue l'historique dans les stratégies fantômes et l'archive
+        (après restauration de l'état).
+        """
+        self.shadow.reset()
+        for game_number, G_value, is_even_result in self.history.iter_games():
+            self.shadow.observe(game_number, is_even_result, self.prediction_window, self.target_offset)
+            self.archive.add_game(game_number, G_value)
+
+    # --- Prédictions ---
+
+    def get_current_thresholds(self) -> tuple:
+        if self.auto_mode:
+            return self.auto_even_gap, self.auto_odd_gap
+        return self.manual_even_gap, self.manual_odd_gap
+
+    def index_prediction(self, target_game: int):
+        """Indexe une nouvelle prédiction sur les jeux de sa fenêtre."""
+        for offset in range(self.prediction_window):
+            self.predictions_by_game.setdefault(target_game + offset, []).append(target_game)
+        self.active_prediction_count += 1
+
+    def unindex_prediction(self, target_game: int):
+        """Retire une prédiction terminée de l'index."""
+        for offset in range(self.prediction_window):
+            covering = self.predictions_by_game.get(target_game + offset)
+            if covering and target_game in covering:
+                covering.remove(target_game)
+                if not covering:
+                    del self.predictions_by_game[target_game + offset]
+        self.active_prediction_count -= 1
+
+    def decide(self) -> tuple:
+        """Décision publiée: règle des seuils, ou la stratégie choisie (voir strategies.py)."""
+        if self.strategy is None or self.strategy not in self.shadow.strategies:
+            return self.should_predict()
+
+        if self.active_prediction_count:
+            return (False, None)
+
+        prediction = self.shadow.decisions.get(self.strategy)
+        return (prediction is not None, prediction)
+
+    def should_predict(self) -> tuple:
+        if len(self.history) < self.games_for_analysis:
+            return (False, None)
+
+        if self.auto_mode and not self.initial_analysis_done:
+            if not self.calculate_gap_stats_from_window():
+                return (False, None)
+
+        if not self.auto_mode:
+            self.initial_analysis_done = True
+
+        if self.active_prediction_count:
+            return (False, None)
+
+        even_threshold, odd_threshold = self.get_current_thresholds()
+
+        logger.info(f"{'🤖' if self.auto_mode else '👤'} [{self.source_id}] "
+                    f"Mode {'AUTO' if self.auto_mode else 'MANUEL'} - "
+                    f"Seuils: P={even_threshold}, I={odd_threshold} | "
+                    f"Séries: P={self.current_even_streak}, I={self.current_odd_streak}")
+
+        if self.current_even_streak >= (even_threshold - 1) and self.current_even_streak > 0:
+            return (True, "IMPAIR")
+
+        if self.current_odd_streak >= (odd_threshold - 1) and self.current_odd_streak > 0:
+            return (True, "PAIR")
+
+        return (False, None)
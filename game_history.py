@@ -0,0 +1,126 @@
+"""
+Historique compact des jeux, indexé par numéro de jeu.
+
+Les jeux sont rangés dans un tampon circulaire de `capacity` cases
+(case = numéro % capacity) : valeurs G et horodatages dans des tableaux
+contigus, parité dans un bitmap. L'ajout et l'éviction sont en O(1).
+"""
+
+import time
+from array import array
+
+EMPTY = -1
+
+
+class GameHistory:
+    """
+    Conserve les jeux dont le numéro est dans les `capacity` derniers numéros.
+
+    Un jeu plus récent remplace la case du jeu situé `capacity` numéros plus
+    tôt ; un jeu trop ancien pour la fenêtre est ignoré.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._numbers = array('q', [EMPTY]) * capacity
+        self._g_values = array('i', [0]) * capacity
+        self._timestamps = array('d', [0.0]) * capacity
+        self._parity = bytearray((capacity + 7) // 8)
+        self._count = 0
+        self._max_game = EMPTY
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, game_number: int):
+        return self._numbers[game_number % self.capacity] == game_number
+
+    def __bool__(self):
+        return self._count > 0
+
+    @property
+    def last_game(self):
+        """Plus grand numéro de jeu enregistré (None si vide)."""
+        return self._max_game if self._count else None
+
+    def clear(self):
+        for i in range(self.capacity):
+            self._numbers[i] = EMPTY
+        self._parity[:] = bytes(len(self._parity))
+        self._count = 0
+        self._max_game = EMPTY
+
+    def add(self, game_number: int, G_value: int, timestamp: float = None) -> bool:
+        """
+        Enregistre (ou remplace) un jeu.
+        Retourne False si le jeu est trop ancien pour être conservé.
+        """
+        if self._count and game_number <= self._max_game - self.capacity:
+            return False
+
+        if game_number > self._max_game:
+            self._evict_before(game_number - self.capacity + 1)
+            self._max_game = game_number
+
+        slot = game_number % self.capacity
+        if self._numbers[slot] == EMPTY:
+            self._count += 1
+        self._numbers[slot] = game_number
+        self._g_values[slot] = G_value
+        self._timestamps[slot] = timestamp if timestamp is not None else time.time()
+
+        byte, bit = divmod(slot, 8)
+        if G_value % 2 == 0:
+            self._parity[byte] |= 1 << bit
+        else:
+            self._parity[byte] &= ~(1 << bit) & 0xFF
+        return True
+
+    def _evict_before(self, first_kept: int):
+        """Libère les cases des jeux de numéro < first_kept."""
+        if not self._count:
+            return
+        start = max(self._max_game - self.capacity + 1, 0)
+        stop = min(first_kept, self._max_game + 1)
+        for game_number in range(start, stop):
+            slot = game_number % self.capacity
+            if self._numbers[slot] == game_number:
+                self._numbers[slot] = EMPTY
+                self._count -= 1
+
+    def _is_even_slot(self, slot: int) -> bool:
+        return bool(self._parity[slot >> 3] & (1 << (slot & 7)))
+
+    def get(self, game_number: int):
+        """Retourne (G_value, is_even, timestamp) ou None."""
+        slot = game_number % self.capacity
+        if self._numbers[slot] != game_number:
+            return None
+        return self._g_values[slot], self._is_even_slot(slot), self._timestamps[slot]
+
+    def iter_games(self, reverse: bool = False):
+        """Itère (game_number, G_value, is_even) dans l'ordre des numéros."""
+        if not self._count:
+            return
+        numbers = range(max(self._max_game - self.capacity + 1, 0), self._max_game + 1)
+        if reverse:
+            numbers = reversed(numbers)
+        for game_number in numbers:
+            slot = game_number % self.capacity
+            if self._numbers[slot] == game_number:
+                yield game_number, self._g_values[slot], self._is_even_slot(slot)
+
+    def iter_records(self):
+        """Itère (game_number, G_value, timestamp) dans l'ordre des numéros."""
+        for game_number, G_value, _ in self.iter_games():
+            yield game_number, G_value, self._timestamps[game_number % self.capacity]
+
+    def last(self, n: int) -> list:
+        """Les n derniers jeux, du plus ancien au plus récent."""
+        games = []
+        for game in self.iter_games(reverse=True):
+            if len(games) >= n:
+                break
+            games.append(game)
+        games.reverse()
+        return games
@@ -0,0 +1,194 @@
+"""
+Archive durable des jeux et des prédictions (SQLite, mode WAL).
+
+Les écritures sont mises en file et insérées par lots par un thread dédié,
+sans jamais bloquer la boucle asyncio. Les jeux et prédictions sont indexés
+par source, numéro de jeu, journée et résultat; les lectures ouvrent leur
+propre connexion (à appeler hors de la boucle, via asyncio.to_thread).
+
+La journée (day) est la journée de jeu au format AAAA-MM-JJ, fournie par
+l'appelant: les numéros de jeu repartent de zéro à chaque reset quotidien.
+"""
+
+import sqlite3
+
+from background_writer import BackgroundWriter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    source INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    game_number INTEGER NOT NULL,
+    g_value INTEGER NOT NULL,
+    is_even INTEGER NOT NULL,
+    played_at REAL NOT NULL,
+    PRIMARY KEY (source, day, game_number)
+);
+CREATE INDEX IF NOT EXISTS games_by_number ON games (source, game_number);
+CREATE INDEX IF NOT EXISTS games_by_time ON games (source, played_at);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    source INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    game_number INTEGER NOT NULL,
+    prediction TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    outcome INTEGER,
+    won_offset INTEGER,
+    resolved_at REAL,
+    PRIMARY KEY (source, day, game_number)
+);
+CREATE INDEX IF NOT EXISTS predictions_by_number ON predictions (source, game_number);
+CREATE INDEX IF NOT EXISTS predictions_by_outcome ON predictions (source, outcome, day);
+CREATE INDEX IF NOT EXISTS predictions_by_time ON predictions (source, resolved_at);
+"""
+
+INSERT_GAME = """
+INSERT INTO games (source, day, game_number, g_value, is_even, played_at) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (source, day, game_number) DO UPDATE SET g_value = excluded.g_value, is_even = excluded.is_even
+"""
+
+INSERT_PREDICTION = """
+INSERT INTO predictions (source, day, game_number, prediction, created_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (source, day, game_number) DO UPDATE SET
+    prediction = excluded.prediction, created_at = excluded.created_at,
+    outcome = NULL, won_offset = NULL, resolved_at = NULL
+"""
+
+RESOLVE_PREDICTION = """
+UPDATE predictions SET outcome = ?, won_offset = ?, resolved_at = ?
+WHERE source = ? AND day = ? AND game_number = ?
+"""
+
+STATEMENTS = {'game': INSERT_GAME, 'prediction': INSERT_PREDICTION, 'result': RESOLVE_PREDICTION}
+
+
+class GameStore(BackgroundWriter):
+    thread_name = 'game-store'
+    error_message = "Erreur écriture archive SQLite"
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def start(self):
+        """Crée le schéma puis démarre le thread d'écriture."""
+        if self.running:
+            return
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+        super().start()
+
+    # --- Écritures (sans effet si le stockage n'est pas démarré) ---
+
+    def add_game(self, source: int, day: str, game_number: int, G_value: int, played_at: float):
+        self.put('game', (source, day, game_number, G_value, int(G_value % 2 == 0), played_at))
+
+    def add_prediction(self, source: int, day: str, game_number: int, prediction: str, created_at: float):
+        self.put('prediction', (source, day, game_number, prediction, created_at))
+
+    def resolve_prediction(self, source: int, day: str, game_number: int, won: bool,
+                           won_offset: int, resolved_at: float):
+        self.put('result', (int(won), won_offset, resolved_at, source, day, game_number))
+
+    def open_writer(self):
+        self._connection = self._connect()
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+    def write_batch(self, items: list):
+        """Un lot = une transaction; les lignes consécutives de même type sont groupées."""
+        connection = self._connection
+        with connection:
+            batch_kind, batch = None, []
+            for kind, row in items:
+                if kind != batch_kind and batch:
+                    connection.executemany(STATEMENTS[batch_kind], batch)
+                    batch = []
+                batch_kind = kind
+                batch.append(row)
+            connection.executemany(STATEMENTS[batch_kind], batch)
+
+    # --- Lectures (bloquantes) ---
+
+    def _query(self, sql: str, params: tuple) -> list:
+        connection = self._connect()
+        try:
+            return [dict(row) for row in connection.execute(sql, params)]
+        finally:
+            connection.close()
+
+    def games(self, source: int, day: str = None, start: int = None, end: int = None,
+              limit: int = 1000) -> list:
+        """Jeux d'une source, filtrés par journée et/ou plage de numéros, dans l'ordre."""
+        sql = "SELECT day, game_number, g_value, is_even, played_at FROM games WHERE source = ?"
+        params = [source]
+        if day is not None:
+            sql += " AND day = ?"
+            params.append(day)
+        if start is not None:
+            sql += " AND game_number >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND game_number <= ?"
+            params.append(end)
+        sql += " ORDER BY played_at LIMIT ?"
+        params.append(limit)
+        return self._query(sql, tuple(params))
+
+    def predictions(self, source: int, day: str = None, start: int = None, end: int = None,
+                    outcome: bool = None, limit: int = 1000) -> list:
+        """Prédictions d'une source, filtrées par journée, plage de numéros et/ou résultat."""
+        sql = ("SELECT day, game_number, prediction, created_at, outcome, won_offset, resolved_at "
+               "FROM predictions WHERE source = ?")
+        params = [source]
+        if day is not None:
+            sql += " AND day = ?"
+            params.append(day)
+        if start is not None:
+            sql += " AND game_number >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND game_number <= ?"
+            params.append(end)
+        if outcome is not None:
+            sql += " AND outcome = ?"
+            params.append(int(outcome))
+        sql += " ORDER BY created_at LIMIT ?"
+        params.append(limit)
+        return self._query(sql, tuple(params))
+
+    def days(self, source: int, limit: int = 60) -> list:
+        """Bilan par journée (la plus récente d'abord): jeux, pairs, prédictions gagnées/perdues."""
+        return self._query("""
+            SELECT g.day, g.games, g.even, COALESCE(p.won, 0) AS won, COALESCE(p.lost, 0) AS lost
+            FROM (SELECT day, COUNT(*) AS games, SUM(is_even) AS even
+                  FROM games WHERE source = ? GROUP BY day) AS g
+            LEFT JOIN (SELECT day, SUM(outcome = 1) AS won, SUM(outcome = 0) AS lost
+                       FROM predictions WHERE source = ? GROUP BY day) AS p ON p.day = g.day
+            ORDER BY g.day DESC LIMIT ?
+        """, (source, source, limit))
+
+    def recent_g_values(self, source: int, limit: int) -> list:
+        """(journée, numéro, G) des `limit` derniers jeux, du plus ancien au plus récent."""
+        rows = self._query(
+            "SELECT day, game_number, g_value FROM games WHERE source = ? ORDER BY played_at DESC LIMIT ?",
+            (source, limit))
+        rows.reverse()
+        return rows
+
+    def recent_outcomes(self, source: int, limit: int) -> list:
+        """Résultats (1/0) des `limit` dernières prédictions réglées, dans l'ordre."""
+        rows = self._query(
+            "SELECT outcome FROM predictions WHERE source = ? AND outcome IS NOT NULL "
+            "ORDER BY resolved_at DESC LIMIT ?", (source, limit))
+        return [row['outcome'] for row in reversed(rows)]
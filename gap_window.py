@@ -0,0 +1,75 @@
+"""
+Fenêtre glissante des écarts Pair/Impair.
+
+Maintient les écarts maximums entre deux résultats de même parité sur les
+N derniers jeux, mis à jour en O(1) amorti à chaque jeu ajouté.
+"""
+
+from collections import deque
+
+
+class GapWindow:
+    """
+    Fenêtre des `size` derniers jeux (dans l'ordre des numéros de jeu).
+
+    L'écart entre deux jeux de même parité est la différence de leurs
+    positions dans la fenêtre, comme dans l'analyse historique. Chaque jeu
+    reçoit un numéro de séquence absolu, de sorte qu'un écart ne change pas
+    quand la fenêtre avance. Le maximum de chaque parité est tenu par une
+    file monotone (décroissante) de couples (séquence de départ, écart).
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self._head = 0  # Séquence du plus ancien jeu de la fenêtre
+        self._next = 0  # Séquence du prochain jeu ajouté
+        self._parities = deque()
+        self._last_seq = {True: None, False: None}
+        self._max_gaps = {True: deque(), False: deque()}
+
+    def __len__(self):
+        return self._next - self._head
+
+    def push(self, is_even_result: bool):
+        seq = self._next
+        self._next += 1
+        self._parities.append(is_even_result)
+
+        last = self._last_seq[is_even_result]
+        if last is not None and last >= self._head:
+            gap = seq - last
+            max_gaps = self._max_gaps[is_even_result]
+            while max_gaps and max_gaps[-1][1] <= gap:
+                max_gaps.pop()
+            max_gaps.append((last, gap))
+        self._last_seq[is_even_result] = seq
+
+        if len(self) > self.size:
+            self._evict()
+
+    def _evict(self):
+        head = self._head
+        parity = self._parities.popleft()
+        max_gaps = self._max_gaps[parity]
+        if max_gaps and max_gaps[0][0] == head:
+            max_gaps.popleft()
+        self._head += 1
+
+    def rebuild(self, parities):
+        """Reconstruit la fenêtre à partir des parités, dans l'ordre des jeux."""
+        self.clear()
+        for is_even_result in parities:
+            self.push(is_even_result)
+
+    @property
+    def max_even_gap(self):
+        gaps = self._max_gaps[True]
+        return gaps[0][1] if gaps else None
+
+    @property
+    def max_odd_gap(self):
+        gaps = self._max_gaps[False]
+        return gaps[0][1] if gaps else None
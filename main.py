@@ -1,18 +1,32 @@
 import os
 import asyncio
-import re
 import logging
 import sys
 import json
+import heapq
+import gzip
+import hashlib
+from collections import deque
+from time import monotonic
 from datetime import datetime, timedelta, timezone, time
 from telethon import TelegramClient, events
 from telethon.sessions import StringSession
 from aiohttp import web
 from config import (
     API_ID, API_HASH, BOT_TOKEN, ADMIN_ID,
-    SOURCE_CHANNEL_ID, PREDICTION_CHANNEL_IDS, PORT,
-    DEFAULT_AUTO_CHECK_INTERVAL, MAX_HISTORY_SIZE
+    SOURCES, PORT, DATA_DIR,
+    DEFAULT_AUTO_CHECK_INTERVAL, MAX_HISTORY_SIZE, ANALYTICS_HISTORY_SIZE,
+    PREDICTION_SEND_CONCURRENCY, ADMIN_DIGEST_SECONDS, ADMIN_DIGEST_MAX,
+    CHANNEL_FAILURE_THRESHOLD, CHANNEL_BASE_BACKOFF, CHANNEL_MAX_BACKOFF
 )
+from engine import SourceEngine
+from analytics import analyse, run_lengths, gap_distribution, g_frequency, rolling_win_rate
+from source_parser import parse_source_message
+from state_store import StateStore
+from game_store import GameStore
+from metrics import MetricsRegistry
+from tracing import Trace, TraceBuffer, current_trace, span
+from channel_health import ChannelBreaker
 
 # --- Configuration et Initialisation ---
 logging.basicConfig(
@@ -34,226 +48,380 @@ if not BOT_TOKEN:
     logger.error("BOT_TOKEN manquant")
     exit(1)
 
-logger.info(f"Configuration: SOURCE_CHANNEL={SOURCE_CHANNEL_ID}, PREDICTION_CHANNELS={PREDICTION_CHANNEL_IDS}")
+logger.info(f"Configuration: SOURCES={SOURCES}")
 
 session_string = os.getenv('TELEGRAM_SESSION', '')
 client = TelegramClient(StringSession(session_string), API_ID, API_HASH)
 
 # --- Variables Globales d'État ---
-games_history = {}
-pending_finalization = {}
-pending_predictions = {}
 
-current_even_streak = 0
-current_odd_streak = 0
+# Un moteur par canal source: source_id -> SourceEngine (voir engine.py)
+ENGINES = {
+    # Canaux de prédiction: uniquement ceux de dynamic_channels.json (/addchannel)
+    source_id: SourceEngine(source_id, [], MAX_HISTORY_SIZE, ANALYTICS_HISTORY_SIZE)
+    for source_id in SOURCES
+}
+# Source principale: reçoit l'état et les canaux sauvegardés avant le multi-source
+PRIMARY_SOURCE = SOURCES[0]
 
-# Écarts en mode manuel (définis par admin)
-manual_even_gap = 3
-manual_odd_gap = 3
+# Source visée par les commandes admin (/source <id>)
+selected_source = PRIMARY_SOURCE
 
-# Écarts en mode auto (calculés par le bot)
-auto_even_gap = 3
-auto_odd_gap = 3
+# Échéances des prédictions: tas de (échéance monotone, source, jeu)
+prediction_deadlines = []
+deadline_wakeup = asyncio.Event()
 
-auto_mode = True
-
-last_game_number = 0
-last_G_value = 0
-
-total_even_count = 0
-total_odd_count = 0
-total_predictions_made = 0
-total_predictions_won = 0
-total_predictions_lost = 0
+# Notifications admin en attente d'envoi (tâche de fond process_admin_notifications)
+admin_queue = asyncio.Queue(maxsize=500)
 
 source_channel_ok = False
 
-DYNAMIC_PREDICTION_CHANNELS = []
-
-PREDICTION_WINDOW = 3
 PREDICTION_TIMEOUT_MINUTES = 20
 
-initial_analysis_done = False
-GAMES_FOR_ANALYSIS = 20
+CHANNELS_FILE = os.path.join(DATA_DIR, 'dynamic_channels.json')
+
+# Démarrage à chaud: messages source relus au démarrage
+WARM_START_MESSAGES = 200
+WARM_START_BATCH = 100
+WARM_START_MAX_BATCHES = 100  # Lots lus au plus par identifiants (après une longue coupure)
+
+source_ready = asyncio.Event()  # Levé une fois le démarrage à chaud terminé
+
+# Persistance de l'état: instantané + journal (rejoués au démarrage)
+STATE_SNAPSHOT_FILE = os.path.join(DATA_DIR, 'engine_state.json')
+STATE_WAL_FILE = os.path.join(DATA_DIR, 'engine_state.wal')
+STATE_SNAPSHOT_EVERY = 500  # Entrées de journal entre deux instantanés
+
+state_store = StateStore(STATE_SNAPSHOT_FILE, STATE_WAL_FILE)
+state_records_since_snapshot = 0
+
+# Archive durable des jeux et prédictions (SQLite), conservée aux resets et redémarrages
+GAME_DB_FILE = os.path.join(DATA_DIR, 'games.db')
+game_store = GameStore(GAME_DB_FILE)
+
+# Écouteurs des événements du moteur, appelés avec (kind, data):
+# 'game' (jeu enregistré), 'prediction' (nouvelle prédiction), 'result' (gagnée/perdue)
+event_listeners = []
+
+# Version de l'état, incrémentée à chaque changement visible sur le tableau de bord
+state_version = 0
+
+# --- Métriques (/metrics) ---
+METRICS = MetricsRegistry()
+messages_parsed_metric = METRICS.counter(
+    'bot_messages_parsed_total', "Messages des canaux source analysés, par source et statut",
+    ('source', 'status'))
+games_recorded_metric = METRICS.counter(
+    'bot_games_recorded_total', "Jeux finalisés enregistrés, par source", ('source',))
+predictions_made_metric = METRICS.counter(
+    'bot_predictions_made_total', "Prédictions envoyées, par source", ('source',))
+predictions_won_metric = METRICS.counter(
+    'bot_predictions_won_total', "Prédictions gagnées, par source et offset", ('source', 'offset'))
+predictions_lost_metric = METRICS.counter(
+    'bot_predictions_lost_total', "Prédictions perdues, par source", ('source',))
+channel_send_metric = METRICS.histogram(
+    'bot_channel_send_seconds', "Durée d'envoi d'une prédiction, par canal", ('channel',))
+channel_send_errors_metric = METRICS.counter(
+    'bot_channel_send_errors_total', "Échecs d'envoi, par canal", ('channel',))
+channel_edit_metric = METRICS.histogram(
+    'bot_channel_edit_seconds', "Durée d'édition d'une prédiction, par canal", ('channel',))
+channel_edit_errors_metric = METRICS.counter(
+    'bot_channel_edit_errors_total', "Échecs d'édition, par canal", ('channel',))
+channel_skipped_metric = METRICS.counter(
+    'bot_channel_skipped_total', "Envois/éditions ignorés (disjoncteur ouvert), par canal", ('channel',))
+channel_breaker_open_metric = METRICS.counter(
+    'bot_channel_breaker_open_total', "Ouvertures du disjoncteur, par canal", ('channel',))
+prediction_delivery_metric = METRICS.histogram(
+    'bot_prediction_delivery_seconds', "Délai entre la finalisation source et l'envoi de la prédiction")
+
+# Traces des derniers jeux finalisés (/debug/traces)
+TRACE_BUFFER_SIZE = 200
+TRACES = TraceBuffer(TRACE_BUFFER_SIZE)
+
+def record_metrics(kind: str, data: dict):
+    source = data['source']
+    if kind == 'game':
+        games_recorded_metric.inc(source)
+    elif kind == 'prediction':
+        predictions_made_metric.inc(source)
+    elif kind == 'result':
+        if data['won']:
+            predictions_won_metric.inc(source, data['offset'])
+        else:
+            predictions_lost_metric.inc(source)
 
-CHANNELS_FILE = 'dynamic_channels.json'
+event_listeners.append(record_metrics)
 
 # --- Fonctions Utilitaires ---
 
 def load_dynamic_channels():
-    global DYNAMIC_PREDICTION_CHANNELS
+    """
+    Charge les canaux de prédiction par source: {"source_id": [canaux]}.
+    L'ancien format (simple liste) s'applique à la source principale.
+    """
     try:
         if os.path.exists(CHANNELS_FILE):
             with open(CHANNELS_FILE, 'r') as f:
                 loaded = json.load(f)
-                if loaded:
-                    DYNAMIC_PREDICTION_CHANNELS = loaded
-                    logger.info(f"📂 Canaux chargés: {len(DYNAMIC_PREDICTION_CHANNELS)}")
+            if isinstance(loaded, list):
+                loaded = {str(PRIMARY_SOURCE): loaded}
+            for source_id, channels in loaded.items():
+                engine = ENGINES.get(int(source_id))
+                if engine is not None:
+                    engine.channels = channels
+            logger.info(f"📂 Canaux chargés: {sum(len(e.channels) for e in ENGINES.values())}")
     except Exception as e:
         logger.error(f"Erreur chargement canaux: {e}")
 
 def save_dynamic_channels():
+    mark_state_changed()
     try:
         with open(CHANNELS_FILE, 'w') as f:
-            json.dump(DYNAMIC_PREDICTION_CHANNELS, f)
-        logger.info(f"💾 Canaux sauvegardés: {len(DYNAMIC_PREDICTION_CHANNELS)}")
+            json.dump({str(source_id): engine.channels for source_id, engine in ENGINES.items()}, f)
+        logger.info(f"💾 Canaux sauvegardés: {sum(len(e.channels) for e in ENGINES.values())}")
     except Exception as e:
         logger.error(f"Erreur sauvegarde canaux: {e}")
 
-def extract_game_number(message: str):
-    match = re.search(r"#N\s*(\d+)", message, re.IGNORECASE)
-    if match:
-        return int(match.group(1))
-    return None
+def mark_state_changed():
+    """Invalide les pages mises en cache (tableau de bord, /api/state)."""
+    global state_version
+    state_version += 1
 
-def extract_G_value(message: str):
-    """
-    Extrait la valeur G du message.
-    G est le premier score (côté gauche) du jeu, indépendamment du gagnant.
-    Format: #Nxxx. [✅]SCORE(cartes) [- / 🔰] [✅]SCORE(cartes)
-    """
-    match = re.search(r"#N\s*\d+[^\d]*?(\d+)", message)
-    if match:
-        return int(match.group(1))
-    return None
+def emit_event(kind: str, data: dict):
+    mark_state_changed()
+    for listener in event_listeners:
+        try:
+            listener(kind, data)
+        except Exception as e:
+            logger.error(f"Erreur écouteur {kind}: {e}")
 
 def is_even(number: int) -> bool:
     return number % 2 == 0
 
-def is_message_finalized(message: str) -> bool:
-    return '✅' in message or '🔰' in message
-
-def is_message_pending(message: str) -> bool:
-    return '⏰' in message or '▶️' in message
-
-def get_message_status(message: str) -> str:
-    if is_message_finalized(message):
-        return 'finalized'
-    elif is_message_pending(message):
-        return 'pending'
-    return 'unknown'
-
-# --- Analyse des Écarts ---
+# --- Persistance de l'État ---
+
+def serialize_prediction(pred: dict) -> dict:
+    return {
+        'prediction': pred['prediction'],
+        'message_ids': [[channel_id, msg_id] for channel_id, msg_id in pred['message_ids'].items()],
+        'status': pred['status'],
+        'created_at': pred['created_at'],
+        'checked_games': list(pred['checked_games']),
+    }
+
+def deserialize_prediction(data: dict) -> dict:
+    return {
+        'prediction': data['prediction'],
+        'message_ids': {channel_id: msg_id for channel_id, msg_id in data['message_ids']},
+        'status': data['status'],
+        'created_at': data['created_at'],
+        'check_count': len(data['checked_games']),
+        'checked_games': list(data['checked_games']),
+    }
+
+def export_state() -> dict:
+    return {'sources': {
+        str(source_id): {
+            'games': [list(record) for record in engine.history.iter_records()],
+            'predictions': [[n, serialize_prediction(p)] for n, p in engine.pending_predictions.items()],
+            'state': engine.state_fields(),
+        }
+        for source_id, engine in ENGINES.items()
+    }}
 
-def calculate_gap_stats_from_window():
-    global auto_even_gap, auto_odd_gap, initial_analysis_done
-    
-    if not auto_mode:
-        logger.info("👤 Mode manuel actif - Pas de recalcul auto des écarts")
-        return False
-    
-    if len(games_history) < GAMES_FOR_ANALYSIS:
-        return False
-    
-    sorted_games = sorted(games_history.items(), key=lambda x: x[0])[-GAMES_FOR_ANALYSIS:]
-    
-    even_gaps = []
-    odd_gaps = []
+def log_state(engine: SourceEngine, record: dict):
+    """Ajoute un changement d'état d'une source au journal (écrit par le thread de stockage)."""
+    global state_records_since_snapshot
     
-    last_even_idx = None
-    last_odd_idx = None
-    
-    for idx, (game_num, game_data) in enumerate(sorted_games):
-        if game_data['is_even']:
-            if last_even_idx is not None:
-                gap = idx - last_even_idx
-                even_gaps.append(gap)
-            last_even_idx = idx
-        else:
-            if last_odd_idx is not None:
-                gap = idx - last_odd_idx
-                odd_gaps.append(gap)
-            last_odd_idx = idx
-    
-    old_even_gap = auto_even_gap
-    old_odd_gap = auto_odd_gap
-    
-    if even_gaps:
-        auto_even_gap = max(even_gaps)
-        auto_even_gap = max(2, min(auto_even_gap, 8))
+    if not state_store.running:
+        return
     
-    if odd_gaps:
-        auto_odd_gap = max(odd_gaps)
-        auto_odd_gap = max(2, min(auto_odd_gap, 8))
+    record['s'] = engine.source_id
+    state_store.append(record)
+    state_records_since_snapshot += 1
+    if state_records_since_snapshot >= STATE_SNAPSHOT_EVERY:
+        take_state_snapshot()
+
+def log_state_fields(engine: SourceEngine):
+    mark_state_changed()
+    log_state(engine, {'t': 'state', 'state': engine.state_fields()})
+
+def take_state_snapshot():
+    global state_records_since_snapshot
+    
+    if state_store.running:
+        state_store.snapshot(export_state())
+        state_records_since_snapshot = 0
+
+def load_source_state(engine: SourceEngine, data: dict):
+    for n, G, ts in data['games']:
+        engine.history.add(n, G, ts)
+    for n, pred in data['predictions']:
+        engine.pending_predictions[n] = deserialize_prediction(pred)
+    engine.apply_state_fields(data['state'])
+
+def apply_state_record(record: dict):
+    engine = ENGINES.get(record['s'])
+    if engine is None:
+        return
     
-    initial_analysis_done = True
+    kind = record['t']
+    if kind == 'game':
+        engine.history.add(record['n'], record['g'], record['ts'])
+    elif kind == 'pred':
+        engine.pending_predictions[record['n']] = deserialize_prediction(record['pred'])
+    elif kind == 'done':
+        engine.pending_predictions.pop(record['n'], None)
+    elif kind == 'state':
+        engine.apply_state_fields(record['state'])
+    elif kind == 'reset':
+        reset_engine_state(engine)
+
+def restore_state() -> bool:
+    """Recharge l'état sauvegardé (instantané + journal) avant le démarrage."""
+    started = monotonic()
+    snapshot, records = state_store.load()
+    if snapshot is None and not records:
+        return False
     
-    if old_even_gap != auto_even_gap or old_odd_gap != auto_odd_gap:
-        logger.info(f"📊 Écarts AUTO mis à jour - P:{old_even_gap}→{auto_even_gap}, I:{old_odd_gap}→{auto_odd_gap}")
+    reset_engine_state()
+    if snapshot:
+        for source_id, data in snapshot['sources'].items():
+            engine = ENGINES.get(int(source_id))
+            if engine is not None:
+                load_source_state(engine, data)
+    for record in records:
+        apply_state_record(record)
+    
+    since = last_daily_reset_time().timestamp()
+    restored = False
+    for engine in ENGINES.values():
+        history = engine.history
+        # État antérieur au dernier reset quotidien (bot arrêté pendant le reset)
+        newest = history.get(history.last_game) if history else None
+        if newest and newest[2] < since:
+            logger.info(f"💾 [{engine.source_id}] État sauvegardé antérieur au reset quotidien, ignoré")
+            reset_engine_state(engine)
+            continue
+        
+        engine.calculate_current_streaks()
+        engine.rebuild_gap_window()
+        engine.prime_from_history()
+        for target_game, pred in engine.pending_predictions.items():
+            elapsed = (datetime.now() - datetime.fromisoformat(pred['created_at'])).total_seconds()
+            register_prediction(engine, target_game, monotonic() + PREDICTION_TIMEOUT_MINUTES * 60 - elapsed)
+        
+        restored = restored or bool(history)
+        logger.info(f"💾 [{engine.source_id}] État restauré: {len(history)} jeux, "
+                    f"{len(engine.pending_predictions)} prédiction(s) en cours")
     
-    return True
+    logger.info(f"💾 Restauration terminée en {(monotonic() - started) * 1000:.1f} ms")
+    return restored
 
-def calculate_current_streaks():
-    global current_even_streak, current_odd_streak
-    
-    if not games_history:
+def load_archive(engine: SourceEngine):
+    """
+    Recharge l'archive longue durée depuis la base SQLite (jeux des journées
+    précédentes et résultats des prédictions), puis y rejoue l'historique restauré.
+    """
+    started = monotonic()
+    archive = engine.archive
+    rows = game_store.recent_g_values(engine.source_id, archive.capacity)
+    outcomes = game_store.recent_outcomes(engine.source_id, archive.capacity)
+    if not rows and not outcomes:
         return
     
-    sorted_games = sorted(games_history.items(), key=lambda x: x[0])
-    
-    current_even_streak = 0
-    current_odd_streak = 0
-    
-    for game_num, game_data in reversed(sorted_games):
-        is_even_result = game_data['is_even']
-        
-        if current_even_streak == 0 and current_odd_streak == 0:
-            if is_even_result:
-                current_even_streak = 1
-            else:
-                current_odd_streak = 1
-        else:
-            if is_even_result and current_odd_streak == 0:
-                current_even_streak += 1
-            elif not is_even_result and current_even_streak == 0:
-                current_odd_streak += 1
-            else:
-                break
+    archive.clear()
+    day = None
+    for row in rows:
+        if row['day'] != day:
+            archive.new_session()
+            day = row['day']
+        archive.add_game(row['game_number'], row['g_value'])
+    if day != game_day(datetime.now().timestamp()):
+        archive.new_session()
+    # Jeux restaurés pas encore écrits en base (arrêt avant l'écriture du lot)
+    for game_number, G_value, _ in engine.history.iter_games():
+        archive.add_game(game_number, G_value)
+    for won in outcomes:
+        archive.add_outcome(won)
+    
+    logger.info(f"🗄️ [{engine.source_id}] Archive rechargée: {len(archive)} jeux, "
+                f"{archive.outcome_count} prédictions ({(monotonic() - started) * 1000:.1f} ms)")
 
 # --- Logique de Prédiction ---
 
-def get_current_thresholds():
-    if auto_mode:
-        return auto_even_gap, auto_odd_gap
-    else:
-        return manual_even_gap, manual_odd_gap
-
-def should_predict() -> tuple:
-    global initial_analysis_done
-    
-    if len(games_history) < GAMES_FOR_ANALYSIS:
-        return (False, None)
-    
-    if auto_mode and not initial_analysis_done:
-        if not calculate_gap_stats_from_window():
-            return (False, None)
-    
-    if not auto_mode:
-        initial_analysis_done = True
-    
-    active_predictions = [p for p in pending_predictions.values() if p['status'] == '⏳']
-    if active_predictions:
-        return (False, None)
-    
-    calculate_current_streaks()
-    
-    even_threshold, odd_threshold = get_current_thresholds()
-    
-    logger.info(f"{'🤖' if auto_mode else '👤'} Mode {'AUTO' if auto_mode else 'MANUEL'} - "
-                f"Seuils: P={even_threshold}, I={odd_threshold} | "
-                f"Séries: P={current_even_streak}, I={current_odd_streak}")
-    
-    if current_even_streak >= (even_threshold - 1) and current_even_streak > 0:
-        return (True, "IMPAIR")
-    
-    if current_odd_streak >= (odd_threshold - 1) and current_odd_streak > 0:
-        return (True, "PAIR")
-    
-    return (False, None)
-
-async def send_prediction_to_channels(target_game: int, prediction: str):
-    global total_predictions_made
+def selected_engine() -> SourceEngine:
+    """Moteur de la source visée par les commandes admin."""
+    return ENGINES[selected_source]
+
+def source_tag(engine: SourceEngine) -> str:
+    """Repère de la source dans les notifications (vide avec une seule source)."""
+    return f" [{engine.source_id}]" if len(ENGINES) > 1 else ""
+
+def register_prediction(engine: SourceEngine, target_game: int, deadline: float = None):
+    """Indexe une nouvelle prédiction sur les jeux de sa fenêtre et arme son échéance."""
+    engine.index_prediction(target_game)
+    
+    if deadline is None:
+        deadline = monotonic() + PREDICTION_TIMEOUT_MINUTES * 60
+    engine.pending_predictions[target_game]['deadline'] = deadline
+    heapq.heappush(prediction_deadlines, (deadline, engine.source_id, target_game))
+    deadline_wakeup.set()
+
+def unregister_prediction(engine: SourceEngine, target_game: int):
+    """Retire une prédiction terminée de l'index."""
+    engine.unindex_prediction(target_game)
+    deadline_wakeup.set()
+
+# --- Santé des Canaux ---
+
+channel_breaker = ChannelBreaker(CHANNEL_FAILURE_THRESHOLD, CHANNEL_BASE_BACKOFF, CHANNEL_MAX_BACKOFF)
+
+def channel_succeeded(channel_id: int):
+    if channel_breaker.record_success(channel_id):
+        logger.info(f"✅ Canal {channel_id} de nouveau accessible")
+        notify_admin(f"✅ Canal `{channel_id}` de nouveau accessible")
+        mark_state_changed()
+
+def channel_failed(channel_id: int, error):
+    if channel_breaker.record_failure(channel_id, error):
+        retry_in = channel_breaker.describe(channel_id)['retry_in']
+        logger.warning(f"⚠️ Canal {channel_id} suspendu {retry_in:.0f}s après "
+                       f"{CHANNEL_FAILURE_THRESHOLD}+ échecs: {error}")
+        channel_breaker_open_metric.inc(channel_id)
+        notify_admin(f"⚠️ Canal `{channel_id}` suspendu ({retry_in:.0f}s)\n"
+                     f"Erreur: {str(error)[:100]}")
+        mark_state_changed()
+
+async def send_to_channel(channel_id: int, text: str, target_game: int, semaphore: asyncio.Semaphore) -> tuple:
+    """
+    Envoie une prédiction à un canal.
+    Retourne (channel_id, message_id), message_id = 0 en cas d'échec
+    ou si le disjoncteur du canal est ouvert.
+    """
+    if not channel_breaker.allow(channel_id):
+        channel_skipped_metric.inc(channel_id)
+        return channel_id, 0
     
+    async with semaphore:
+        started = monotonic()
+        try:
+            with span('send', channel=channel_id):
+                pred_msg = await client.send_message(channel_id, text)
+            logger.info(f"✅ Prédiction envoyée au canal {channel_id}: Jeu #{target_game}")
+            channel_succeeded(channel_id)
+            return channel_id, pred_msg.id
+        except Exception as e:
+            logger.error(f"❌ Erreur envoi au canal {channel_id}: {e}")
+            channel_send_errors_metric.inc(channel_id)
+            channel_failed(channel_id, e)
+            return channel_id, 0
+        finally:
+            channel_send_metric.observe(monotonic() - started, channel_id)
+
+async def send_prediction_to_channels(engine: SourceEngine, target_game: int, prediction: str,
+                                      received_at: float = None):
+    """received_at: instant (monotone) de réception du jeu source finalisé."""
     try:
         # Nouveau format de message
         emoji = "🔵" if prediction == "PAIR" else "🔴"
@@ -261,22 +429,20 @@ async def send_prediction_to_channels(target_game: int, prediction: str):
 Total individuelle Joueur 
  {emoji} {prediction} :⏳"""
         
-        message_ids = {}
-        
-        for channel_id in DYNAMIC_PREDICTION_CHANNELS:
-            if channel_id and channel_id != 0:
-                try:
-                    pred_msg = await client.send_message(channel_id, prediction_msg)
-                    message_ids[channel_id] = pred_msg.id
-                    logger.info(f"✅ Prédiction envoyée au canal {channel_id}: Jeu #{target_game}")
-                except Exception as e:
-                    logger.error(f"❌ Erreur envoi au canal {channel_id}: {e}")
-                    message_ids[channel_id] = 0
+        # Envoi simultané vers tous les canaux (limité par PREDICTION_SEND_CONCURRENCY)
+        semaphore = asyncio.Semaphore(max(1, PREDICTION_SEND_CONCURRENCY))
+        channels = [c for c in engine.channels if c and c != 0]
+        results = await asyncio.gather(
+            *(send_to_channel(channel_id, prediction_msg, target_game, semaphore) for channel_id in channels)
+        )
+        message_ids = dict(results)
+        if received_at is not None:
+            prediction_delivery_metric.observe(monotonic() - received_at)
         
         if not message_ids or all(v == 0 for v in message_ids.values()):
-            logger.warning("⚠️ Aucun canal de prédiction accessible")
+            logger.warning(f"⚠️ [{engine.source_id}] Aucun canal de prédiction accessible")
         
-        pending_predictions[target_game] = {
+        engine.pending_predictions[target_game] = {
             'prediction': prediction,
             'message_ids': message_ids,
             'status': '⏳',  # En attente
@@ -284,16 +450,28 @@ Total individuelle Joueur
             'check_count': 0,
             'checked_games': []
         }
+        register_prediction(engine, target_game)
+        log_state(engine, {'t': 'pred', 'n': target_game,
+                           'pred': serialize_prediction(engine.pending_predictions[target_game])})
+        created_at = datetime.fromisoformat(engine.pending_predictions[target_game]['created_at']).timestamp()
+        game_store.add_prediction(engine.source_id, game_day(created_at), target_game, prediction, created_at)
         
-        total_predictions_made += 1
+        engine.total_predictions_made += 1
+        emit_event('prediction', {
+            'source': engine.source_id,
+            'game_number': target_game,
+            'prediction': prediction,
+            'message_ids': message_ids,
+        })
         
-        even_thr, odd_thr = get_current_thresholds()
+        even_thr, odd_thr = engine.get_current_thresholds()
         channels_str = ', '.join([str(c) for c in message_ids.keys() if message_ids[c] != 0])
+        auto_mode = engine.auto_mode
         
-        await notify_admin(f"🔮 Nouvelle prédiction: Jeu #{target_game} = {prediction}\n"
-                          f"{'🤖' if auto_mode else '👤'} Mode: {'AUTO' if auto_mode else 'MANUEL'}\n"
-                          f"📊 Seuils: P={even_thr}/I={odd_thr}\n"
-                          f"📡 Canaux: {channels_str}")
+        notify_admin(f"🔮 Nouvelle prédiction{source_tag(engine)}: Jeu #{target_game} = {prediction}\n"
+                     f"{'🤖' if auto_mode else '👤'} Mode: {'AUTO' if auto_mode else 'MANUEL'}\n"
+                     f"📊 Seuils: P={even_thr}/I={odd_thr}\n"
+                     f"📡 Canaux: {channels_str}")
         
         return message_ids
         
@@ -301,9 +479,64 @@ Total individuelle Joueur
         logger.error(f"Erreur prédiction: {e}")
         return {}
 
-async def update_prediction_status(game_number: int, new_status: str, won_at_offset: int = None):
-    global total_predictions_won, total_predictions_lost
+# --- File d'Éditions (arrière-plan) ---
+
+# Éditions en attente par prédiction: (source, game_number) -> (message_ids, texte)
+# Seul le dernier texte d'une prédiction est conservé.
+pending_edits = {}
+edit_wakeup = asyncio.Event()
+
+def queue_prediction_edit(engine: SourceEngine, game_number: int, message_ids: dict, text: str):
+    pending_edits[engine.source_id, game_number] = (dict(message_ids), text)
+    edit_wakeup.set()
+
+async def edit_channel_message(channel_id: int, msg_id: int, text: str, semaphore: asyncio.Semaphore):
+    if not channel_breaker.allow(channel_id):
+        channel_skipped_metric.inc(channel_id)
+        return
     
+    async with semaphore:
+        started = monotonic()
+        try:
+            await client.edit_message(channel_id, msg_id, text)
+            channel_succeeded(channel_id)
+        except Exception as e:
+            logger.error(f"❌ Erreur édition canal {channel_id}: {e}")
+            channel_edit_errors_metric.inc(channel_id)
+            channel_failed(channel_id, e)
+        finally:
+            channel_edit_metric.observe(monotonic() - started, channel_id)
+
+async def flush_edit_queue():
+    """Envoie toutes les éditions en attente, jusqu'à ce que la file soit vide."""
+    while pending_edits:
+        batch = list(pending_edits.values())
+        pending_edits.clear()
+        
+        semaphore = asyncio.Semaphore(max(1, PREDICTION_SEND_CONCURRENCY))
+        await asyncio.gather(*(
+            edit_channel_message(channel_id, msg_id, text, semaphore)
+            for message_ids, text in batch
+            for channel_id, msg_id in message_ids.items()
+            if channel_id and msg_id > 0
+        ))
+
+async def process_edit_queue():
+    """
+    Applique les éditions de prédictions en arrière-plan, en parallèle sur les canaux.
+    Les changements de statut arrivés pendant un envoi remplacent les précédents.
+    """
+    while True:
+        try:
+            await edit_wakeup.wait()
+            edit_wakeup.clear()
+            await flush_edit_queue()
+        except Exception as e:
+            logger.error(f"Erreur file d'éditions: {e}")
+
+async def update_prediction_status(engine: SourceEngine, game_number: int, new_status: str,
+                                   won_at_offset: int = None):
+    pending_predictions = engine.pending_predictions
     try:
         if game_number not in pending_predictions:
             logger.warning(f"⚠️ Tentative de mise à jour prédiction #{game_number} introuvable")
@@ -335,31 +568,49 @@ async def update_prediction_status(game_number: int, new_status: str, won_at_off
 Total individuelle Joueur 
  {emoji} {prediction} :{status_text}"""
         
-        updated_channels = []
-        failed_channels = []
-        for channel_id, msg_id in message_ids.items():
-            if channel_id and msg_id > 0:
-                try:
-                    await client.edit_message(channel_id, msg_id, updated_msg)
-                    updated_channels.append(str(channel_id))
-                except Exception as e:
-                    logger.error(f"❌ Erreur édition canal {channel_id}: {e}")
-                    failed_channels.append(str(channel_id))
+        queue_prediction_edit(engine, game_number, message_ids, updated_msg)
         
         pred['status'] = status_text
         
+        if new_status.startswith('✅') or new_status == '❌':
+            created_at = datetime.fromisoformat(pred['created_at']).timestamp()
+            game_store.resolve_prediction(engine.source_id, game_day(created_at), game_number,
+                                          new_status.startswith('✅'), won_at_offset,
+                                          datetime.now().timestamp())
+        
         if new_status.startswith('✅'):
-            total_predictions_won += 1
+            engine.total_predictions_won += 1
+            engine.archive.add_outcome(True)
+            emit_event('result', {
+                'source': engine.source_id,
+                'game_number': game_number,
+                'prediction': prediction,
+                'won': True,
+                'offset': won_at_offset,
+            })
             win_info = f"en {won_at_offset} coup(s)" if won_at_offset is not None else ""
-            logger.info(f"🏆 Prédiction #{game_number} GAGNÉE {win_info}")
-            await notify_admin(f"✅ **PRÉDICTION GAGNÉE**\nJeu #{game_number}: {prediction} {status_emoji}")
+            logger.info(f"🏆 [{engine.source_id}] Prédiction #{game_number} GAGNÉE {win_info}")
+            notify_admin(f"✅ **PRÉDICTION GAGNÉE**{source_tag(engine)}\n"
+                         f"Jeu #{game_number}: {prediction} {status_emoji}")
+            unregister_prediction(engine, game_number)
             del pending_predictions[game_number]
+            log_state(engine, {'t': 'done', 'n': game_number})
             
         elif new_status == '❌':
-            total_predictions_lost += 1
-            logger.info(f"💀 Prédiction #{game_number} PERDUE")
-            await notify_admin(f"❌ **PRÉDICTION PERDUE**\nJeu #{game_number}: {prediction}")
+            engine.total_predictions_lost += 1
+            engine.archive.add_outcome(False)
+            emit_event('result', {
+                'source': engine.source_id,
+                'game_number': game_number,
+                'prediction': prediction,
+                'won': False,
+                'offset': None,
+            })
+            logger.info(f"💀 [{engine.source_id}] Prédiction #{game_number} PERDUE")
+            notify_admin(f"❌ **PRÉDICTION PERDUE**{source_tag(engine)}\nJeu #{game_number}: {prediction}")
+            unregister_prediction(engine, game_number)
             del pending_predictions[game_number]
+            log_state(engine, {'t': 'done', 'n': game_number})
         
         return True
         
@@ -369,17 +620,19 @@ Total individuelle Joueur
         logger.error(traceback.format_exc())
         return False
 
-async def check_prediction_result(game_number: int, G_value: int, is_even: bool):
+async def check_prediction_result(engine: SourceEngine, game_number: int, G_value: int, is_even: bool):
     """
     Vérifie si une prédiction active correspond au résultat G du jeu actuel.
     """
-    for pred_game_num, pred_data in list(pending_predictions.items()):
-        if pred_data['status'] not in ['⏳', '🔮']:  # Vérifie si en attente
+    window = engine.prediction_window
+    for pred_game_num in list(engine.predictions_by_game.get(game_number, ())):
+        pred_data = engine.pending_predictions.get(pred_game_num)
+        if pred_data is None or pred_data['status'] not in ['⏳', '🔮']:  # Vérifie si en attente
             continue
             
         offset = game_number - pred_game_num
         
-        if 0 <= offset < PREDICTION_WINDOW:
+        if 0 <= offset < window:
             if game_number in pred_data.get('checked_games', []):
                 logger.info(f"⏩ Jeu #{game_number} déjà vérifié pour prédiction #{pred_game_num}")
                 return
@@ -393,140 +646,311 @@ async def check_prediction_result(game_number: int, G_value: int, is_even: bool)
             pred_data['checked_games'].append(game_number)
             pred_data['check_count'] = len(pred_data['checked_games'])
             pred_data['last_check'] = datetime.now()
+            log_state(engine, {'t': 'pred', 'n': pred_game_num, 'pred': serialize_prediction(pred_data)})
             
             if is_correct:
-                await update_prediction_status(pred_game_num, '✅ GAGNÉ', offset)
+                await update_prediction_status(engine, pred_game_num, '✅ GAGNÉ', offset)
                 return
             
             else:
-                if pred_data['check_count'] >= PREDICTION_WINDOW:
-                    logger.info(f"❌ Prédiction #{pred_game_num} perdue après {PREDICTION_WINDOW} tentatives")
-                    await update_prediction_status(pred_game_num, '❌', None)
+                if pred_data['check_count'] >= window:
+                    logger.info(f"❌ Prédiction #{pred_game_num} perdue après {window} tentatives")
+                    await update_prediction_status(engine, pred_game_num, '❌', None)
                 else:
-                    logger.info(f"⏳ Prédiction #{pred_game_num} toujours en attente ({pred_data['check_count']}/{PREDICTION_WINDOW})")
+                    logger.info(f"⏳ Prédiction #{pred_game_num} toujours en attente ({pred_data['check_count']}/{window})")
 
-async def notify_admin(message: str):
+def notify_admin(message: str):
+    """Met une notification admin en file, sans attendre l'envoi."""
+    if not ADMIN_ID or ADMIN_ID == 0:
+        return
     try:
-        if ADMIN_ID and ADMIN_ID != 0:
-            await client.send_message(ADMIN_ID, f"🤖 *Bot Notification*\n\n{message}", parse_mode='markdown')
+        admin_queue.put_nowait(message)
+    except asyncio.QueueFull:
+        logger.warning("⚠️ File des notifications admin pleine, notification ignorée")
+
+async def send_admin_messages(messages: list):
+    if len(messages) == 1:
+        text = f"🤖 *Bot Notification*\n\n{messages[0]}"
+    else:
+        text = f"🤖 *Bot Notification* ({len(messages)})\n\n" + "\n\n".join(messages)
+    try:
+        await client.send_message(ADMIN_ID, text, parse_mode='markdown')
     except Exception as e:
         logger.error(f"Erreur notif admin: {e}")
 
+async def process_admin_notifications():
+    """
+    Envoie les notifications admin en arrière-plan.
+    Avec ADMIN_DIGEST_SECONDS > 0, les notifications arrivées pendant la fenêtre
+    (jusqu'à ADMIN_DIGEST_MAX) sont regroupées en un seul message.
+    """
+    while True:
+        try:
+            messages = [await admin_queue.get()]
+            
+            if ADMIN_DIGEST_SECONDS > 0:
+                deadline = monotonic() + ADMIN_DIGEST_SECONDS
+                while len(messages) < ADMIN_DIGEST_MAX:
+                    timeout = deadline - monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        messages.append(await asyncio.wait_for(admin_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            
+            await send_admin_messages(messages)
+        except Exception as e:
+            logger.error(f"Erreur file notifications admin: {e}")
+
 # --- Traitement des Messages ---
 
+def record_game(engine: SourceEngine, game_number: int, G_value: int, timestamp: float = None) -> bool:
+    """
+    Enregistre un jeu finalisé: historique, compteurs, séries et fenêtre des écarts.
+    Retourne la parité de G.
+    """
+    if timestamp is None:
+        timestamp = datetime.now().timestamp()
+    
+    is_even_result, stored = engine.add_game(game_number, G_value, timestamp)
+    game_store.add_game(engine.source_id, game_day(timestamp), game_number, G_value, timestamp)
+    if stored:
+        log_state(engine, {'t': 'game', 'n': game_number, 'g': G_value, 'ts': timestamp})
+    else:
+        logger.warning(f"⚠️ [{engine.source_id}] Jeu #{game_number} trop ancien pour l'historique")
+    
+    emit_event('game', {
+        'source': engine.source_id,
+        'game_number': game_number,
+        'G_value': G_value,
+        'is_even': is_even_result,
+    })
+    
+    logger.info(f"✅ [{engine.source_id}] Jeu #{game_number} enregistré: "
+                f"G={G_value} ({'PAIR' if is_even_result else 'IMPAIR'})")
+    return is_even_result
+
 async def process_message(message_text: str, chat_id: int, is_edit: bool = False):
-    global last_game_number, last_G_value, total_even_count, total_odd_count
-    global current_even_streak, current_odd_streak, initial_analysis_done
-    global games_history, pending_finalization
+    engine = ENGINES.get(chat_id)
+    if engine is None:
+        return
     
+    received_at = monotonic()
+    trace = Trace(chat_id)
+    trace_token = current_trace.set(trace)
     try:
-        game_number = extract_game_number(message_text)
-        if game_number is None:
+        with span('parse'):
+            parsed = parse_source_message(message_text)
+        if parsed is None:
+            messages_parsed_metric.inc(chat_id, 'ignored')
             return
         
-        G_value = extract_G_value(message_text)
-        status = get_message_status(message_text)
+        game_number, G_value, status = parsed
+        messages_parsed_metric.inc(chat_id, status)
         
-        logger.info(f"📨 Traitement Jeu #{game_number} | Status: {status} | G={G_value}")
+        logger.info(f"📨 [{chat_id}] Traitement Jeu #{game_number} | Status: {status} | G={G_value}")
         
         if status == 'pending':
-            pending_finalization[game_number] = {
-                'message_text': message_text,
-                'received_at': datetime.now(),
-                'G_value': G_value
-            }
+            evicted = engine.add_pending_game(game_number, G_value, received_at)
+            mark_state_changed()
+            if evicted:
+                logger.info(f"🧹 [{chat_id}] {evicted} jeu(x) jamais finalisé(s) oublié(s)")
             return
         
         if status == 'finalized':
-            if game_number in pending_finalization:
-                del pending_finalization[game_number]
+            engine.pending_finalization.pop(game_number, None)
             
             if G_value is None:
                 logger.warning(f"⚠️ Jeu #{game_number} finalisé mais G non trouvé")
                 return
             
-            if game_number in games_history and not is_edit:
+            if game_number in engine.history and not is_edit:
                 return
             
-            is_even_result = is_even(G_value)
-            
-            if is_even_result:
-                total_even_count += 1
-                parity_str = "PAIR"
-            else:
-                total_odd_count += 1
-                parity_str = "IMPAIR"
-            
-            games_history[game_number] = {
-                'G_value': G_value,
-                'is_even': is_even_result,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            if len(games_history) > GAMES_FOR_ANALYSIS * 2:
-                oldest = min(games_history.keys())
-                del games_history[oldest]
-            
-            logger.info(f"✅ Jeu #{game_number} enregistré: G={G_value} ({parity_str})")
-            
-            if auto_mode and len(games_history) >= GAMES_FOR_ANALYSIS:
-                calculate_gap_stats_from_window()
+            trace.game_number = game_number
+            with span('history'):
+                is_even_result = record_game(engine, game_number, G_value)
+                
+                if engine.auto_mode and len(engine.gap_window) >= engine.games_for_analysis:
+                    engine.calculate_gap_stats_from_window()
             
-            await check_prediction_result(game_number, G_value, is_even_result)
+            with span('check_prediction_result'):
+                await check_prediction_result(engine, game_number, G_value, is_even_result)
             
-            should_pred, prediction_type = should_predict()
+            with span('should_predict'):
+                should_pred, prediction_type = engine.decide()
             
             if should_pred and prediction_type:
-                target_game = game_number + 2
-                if target_game not in pending_predictions:
-                    await send_prediction_to_channels(target_game, prediction_type)
+                target_game = game_number + engine.target_offset
+                if target_game not in engine.pending_predictions:
+                    with span('send_prediction_to_channels', target_game=target_game):
+                        await send_prediction_to_channels(engine, target_game, prediction_type, received_at)
             
-            last_game_number = game_number
-            last_G_value = G_value
+            engine.last_game_number = game_number
+            engine.last_G_value = G_value
+            log_state_fields(engine)
             
     except Exception as e:
         logger.error(f"Erreur traitement: {e}")
         import traceback
         logger.error(traceback.format_exc())
+    finally:
+        current_trace.reset(trace_token)
+        if trace.game_number is not None:
+            trace.finish()
+            TRACES.add(trace)
+
+# --- Démarrage à chaud ---
+
+def note_source_message(engine: SourceEngine, message_id: int):
+    if message_id > engine.last_source_message_id:
+        engine.last_source_message_id = message_id
+
+def last_daily_reset_time() -> datetime:
+    wat_tz = timezone(timedelta(hours=1))
+    now = datetime.now(wat_tz)
+    reset_time = datetime.combine(now.date(), time(1, 0), tzinfo=wat_tz)
+    if now < reset_time:
+        reset_time -= timedelta(days=1)
+    return reset_time
+
+def game_day(timestamp: float) -> str:
+    """Journée de jeu (AAAA-MM-JJ) d'un instant: elle commence au reset quotidien de 1h00 WAT."""
+    wat_tz = timezone(timedelta(hours=1))
+    return (datetime.fromtimestamp(timestamp, wat_tz) - timedelta(hours=1)).date().isoformat()
+
+async def resolve_source_entity(engine: SourceEngine):
+    """Résout et met en cache l'entité du canal source (une seule requête au démarrage)."""
+    if engine.source_entity is None:
+        try:
+            engine.source_entity = await client.get_input_entity(engine.source_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Canal source {engine.source_id} non résolu: {e}")
+            return engine.source_id
+    return engine.source_entity
+
+async def fetch_source_history(engine: SourceEngine, limit: int) -> list:
+    """
+    Récupère les messages récents du canal source, par lots de WARM_START_BATCH.
+    Les comptes bot n'ont pas accès à l'historique: on relit alors par identifiants
+    les messages postérieurs au dernier message source connu, jusqu'au plus récent,
+    et on garde les `limit` derniers.
+    """
+    source = await resolve_source_entity(engine)
+    try:
+        return list(await client.get_messages(source, limit=limit))
+    except Exception as e:
+        logger.warning(f"⚠️ Historique source indisponible ({e}), lecture par identifiants")
+    
+    messages = deque(maxlen=limit)
+    if not engine.last_source_message_id:
+        return []
+    
+    next_id = engine.last_source_message_id + 1
+    for _ in range(WARM_START_MAX_BATCHES):
+        batch = await client.get_messages(source, ids=list(range(next_id, next_id + WARM_START_BATCH)))
+        found = [m for m in batch if m is not None]
+        if not found:
+            break
+        messages.extend(found)
+        next_id += WARM_START_BATCH
+    else:
+        logger.warning(f"⚠️ [{engine.source_id}] Démarrage à chaud: limite de "
+                       f"{WARM_START_MAX_BATCHES} lots atteinte, messages plus récents ignorés")
+    return list(messages)
+
+async def warm_start(engine: SourceEngine):
+    """
+    Amorce l'historique, les séries et les écarts auto depuis les derniers messages
+    du canal source, avant l'activation des gestionnaires d'événements.
+    """
+    started = monotonic()
+    try:
+        messages = await fetch_source_history(engine, WARM_START_MESSAGES)
+    except Exception as e:
+        logger.error(f"Erreur démarrage à chaud [{engine.source_id}]: {e}")
+        return
+    
+    since = last_daily_reset_time()
+    recorded = 0
+    
+    for message in sorted(messages, key=lambda m: m.id):
+        note_source_message(engine, message.id)
+        engine.is_duplicate_message(message.id, message.message or '')
+        if message.date and message.date < since:
+            continue
+        
+        parsed = parse_source_message(message.message or '')
+        if parsed is None:
+            continue
+        
+        game_number, G_value, status = parsed
+        if status != 'finalized' or G_value is None or game_number in engine.history:
+            continue
+        
+        is_even_result = record_game(engine, game_number, G_value,
+                                     message.date.timestamp() if message.date else None)
+        await check_prediction_result(engine, game_number, G_value, is_even_result)
+        engine.last_game_number = game_number
+        engine.last_G_value = G_value
+        recorded += 1
+    
+    if recorded and engine.auto_mode:
+        engine.calculate_gap_stats_from_window()
+    log_state_fields(engine)
+    
+    logger.info(f"🔥 [{engine.source_id}] Démarrage à chaud: {recorded} jeu(x) amorcé(s) "
+                f"sur {len(messages)} message(s) en {(monotonic() - started) * 1000:.0f} ms | "
+                f"Historique: {len(engine.history)}")
 
 # --- Gestionnaires d'Événements ---
 
-@client.on(events.NewMessage())
+# Le filtre chats= compare l'ID marqué (-100...) de l'update, sans requête réseau:
+# les messages hors canaux source ne déclenchent pas ces gestionnaires.
+
+@client.on(events.NewMessage(chats=list(SOURCES)))
 async def handle_message(event):
     try:
-        chat = await event.get_chat()
-        chat_id = chat.id if hasattr(chat, 'id') else event.chat_id
-        if chat_id > 0 and hasattr(chat, 'broadcast') and chat.broadcast:
-            chat_id = -1000000000000 - chat_id
-        
-        if chat_id == SOURCE_CHANNEL_ID:
-            await process_message(event.message.message, chat_id, False)
+        if not source_ready.is_set():
+            await source_ready.wait()
+        engine = ENGINES.get(event.chat_id)
+        if engine is None:
+            return
+        note_source_message(engine, event.message.id)
+        if engine.is_duplicate_message(event.message.id, event.message.message):
+            messages_parsed_metric.inc(event.chat_id, 'duplicate')
+            return
+        await process_message(event.message.message, event.chat_id, False)
     except Exception as e:
         logger.error(f"Erreur handle: {e}")
 
-@client.on(events.MessageEdited())
+@client.on(events.MessageEdited(chats=list(SOURCES)))
 async def handle_edited_message(event):
     try:
-        chat = await event.get_chat()
-        chat_id = chat.id if hasattr(chat, 'id') else event.chat_id
-        if chat_id > 0 and hasattr(chat, 'broadcast') and chat.broadcast:
-            chat_id = -1000000000000 - chat_id
-        
-        if chat_id == SOURCE_CHANNEL_ID:
-            logger.info(f"✏️ Édition détectée")
-            await process_message(event.message.message, chat_id, True)
+        logger.info(f"✏️ Édition détectée")
+        if not source_ready.is_set():
+            await source_ready.wait()
+        engine = ENGINES.get(event.chat_id)
+        if engine is None:
+            return
+        note_source_message(engine, event.message.id)
+        # Édition sans changement de contenu (ou déjà reçue): rien à analyser
+        if engine.is_duplicate_message(event.message.id, event.message.message):
+            messages_parsed_metric.inc(event.chat_id, 'duplicate')
+            return
+        await process_message(event.message.message, event.chat_id, True)
     except Exception as e:
         logger.error(f"Erreur édition: {e}")
 
 # --- Commandes ---
 
-@client.on(events.NewMessage(pattern='/start'))
 async def cmd_start(event):
-    if event.is_group or event.is_channel:
-        return
     await event.respond(
         "🤖 **Bot Prédiction Pair/Impair (basé sur G)**\n\n"
         "Commandes:\n"
+        "`/sources` - Tables suivies\n"
+        "`/source <id>` - Choisir la table des commandes\n"
         "`/status` - État\n"
         "`/info` - Canaux et config\n"
         "`/channels` - Liste canaux\n"
@@ -535,98 +959,140 @@ async def cmd_start(event):
         "`/histo` - Historique (G)\n"
         "`/setmode auto/manual` - Mode\n"
         "`/setgap pair/impair <n>` - Écarts manuels\n"
+        "`/strategies` - Stratégies (fantômes)\n"
+        "`/strategy <nom>` - Stratégie publiée\n"
         "`/stats` - Statistiques\n"
+        "`/runs [n]` - Longueurs des séries (n derniers jeux)\n"
+        "`/gaps [n]` - Écarts par parité\n"
+        "`/gfreq [n]` - Fréquence des G\n"
+        "`/winrate [fenêtre]` - Taux de réussite glissant\n"
+        "`/days [n]` - Bilan des n dernières journées\n"
         "`/reset` - Reset"
     )
 
-@client.on(events.NewMessage(pattern='/status'))
-async def cmd_status(event):
-    if event.is_group or event.is_channel:
+async def cmd_sources(event):
+    lines = [f"🎰 **Tables ({len(ENGINES)})**\n"]
+    for source_id, engine in ENGINES.items():
+        marker = "👉" if source_id == selected_source else "•"
+        lines.append(
+            f"{marker} `{source_id}` | {'🤖' if engine.auto_mode else '👤'} | "
+            f"#{engine.last_game_number} | 📡 {len(engine.channels)} | "
+            f"✅ {engine.total_predictions_won} ❌ {engine.total_predictions_lost}"
+        )
+    lines.append("\n`/source <id>` pour choisir la table des commandes")
+    await event.respond("\n".join(lines))
+
+async def cmd_source(event):
+    global selected_source
+    
+    parts = event.message.message.split()
+    if len(parts) < 2:
+        await event.respond(f"🎰 Table active: `{selected_source}`\nUsage: `/source <id>`")
         return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
+    
+    try:
+        source_id = int(parts[1])
+    except ValueError:
+        await event.respond("❌ ID invalide")
         return
     
-    calculate_current_streaks()
-    even_thr, odd_thr = get_current_thresholds()
+    if source_id not in ENGINES:
+        await event.respond("⚠️ Table inconnue (voir `/sources`)")
+        return
+    
+    selected_source = source_id
+    await event.respond(f"✅ Table active: `{source_id}`")
+
+async def cmd_status(event):
+    engine = selected_engine()
+    even_thr, odd_thr = engine.get_current_thresholds()
     
     msg = (
-        f"📊 **État**\n"
-        f"🎮 Dernier: #{last_game_number}\n"
-        f"🎯 Dernier G: {last_G_value} ({'🔵' if is_even(last_G_value) else '🔴'})\n"
-        f"📈 P:{total_even_count} I:{total_odd_count}\n"
-        f"🔥 Séries: P={current_even_streak} I={current_odd_streak}\n"
-        f"⚙️ Mode: {'🤖 AUTO' if auto_mode else '👤 MANUEL'}\n"
+        f"📊 **État**{source_tag(engine)}\n"
+        f"🎮 Dernier: #{engine.last_game_number}\n"
+        f"🎯 Dernier G: {engine.last_G_value} ({'🔵' if is_even(engine.last_G_value) else '🔴'})\n"
+        f"📈 P:{engine.total_even_count} I:{engine.total_odd_count}\n"
+        f"🔥 Séries: P={engine.current_even_streak} I={engine.current_odd_streak}\n"
+        f"⚙️ Mode: {'🤖 AUTO' if engine.auto_mode else '👤 MANUEL'}\n"
         f"📊 Seuils actifs: P={even_thr} I={odd_thr}\n"
     )
     
-    if auto_mode:
-        msg += f"📈 (Manuels: P={manual_even_gap} I={manual_odd_gap})\n"
+    if engine.auto_mode:
+        msg += f"📈 (Manuels: P={engine.manual_even_gap} I={engine.manual_odd_gap})\n"
     else:
-        msg += f"📈 (Auto: P={auto_even_gap} I={auto_odd_gap})\n"
+        msg += f"📈 (Auto: P={engine.auto_even_gap} I={engine.auto_odd_gap})\n"
     
-    msg += (f"📡 Canaux: {len(DYNAMIC_PREDICTION_CHANNELS)}\n"
-            f"🔮 En cours: {len([p for p in pending_predictions.values() if p['status'] in ['⏳', '🔮']])}\n"
-            f"✅ {total_predictions_won} | ❌ {total_predictions_lost}")
+    msg += (f"📡 Canaux: {len(engine.channels)}\n"
+            f"🔮 En cours: {engine.active_prediction_count}\n"
+            f"✅ {engine.total_predictions_won} | ❌ {engine.total_predictions_lost}")
     
     await event.respond(msg)
 
-@client.on(events.NewMessage(pattern='/info'))
 async def cmd_info(event):
-    if event.is_group or event.is_channel:
-        return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
-        return
+    engine = selected_engine()
+    even_thr, odd_thr = engine.get_current_thresholds()
     
-    even_thr, odd_thr = get_current_thresholds()
-    
-    channels_str = '\n'.join([f"• `{c}`" for c in DYNAMIC_PREDICTION_CHANNELS])
+    channels_str = '\n'.join([f"• `{c}`" for c in engine.channels])
     
     msg = (
         f"ℹ️ **Configuration (Analyse sur G)**\n"
-        f"📡 Source: `{SOURCE_CHANNEL_ID}`\n"
-        f"📡 Prédictions ({len(DYNAMIC_PREDICTION_CHANNELS)}):\n{channels_str}\n\n"
-        f"⚙️ Mode: {'🤖 AUTO' if auto_mode else '👤 MANUEL'}\n"
+        f"📡 Source: `{engine.source_id}`\n"
+        f"📡 Prédictions ({len(engine.channels)}):\n{channels_str}\n\n"
+        f"⚙️ Mode: {'🤖 AUTO' if engine.auto_mode else '👤 MANUEL'}\n"
         f"📊 Seuils actifs: P={even_thr} I={odd_thr}\n"
-        f"🎮 Dernier: `{last_game_number}` (G={last_G_value})\n"
-        f"⏳ En attente: {len(pending_finalization)}"
+        f"🎮 Dernier: `{engine.last_game_number}` (G={engine.last_G_value})\n"
+        f"⏳ En attente: {len(engine.pending_finalization)}"
     )
     await event.respond(msg)
 
-@client.on(events.NewMessage(pattern='/channels'))
-async def cmd_channels(event):
-    if event.is_group or event.is_channel:
-        return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
-        await event.respond("⛔ Admin uniquement")
-        return
+# Titres des canaux: channel_id -> (titre ou None si inaccessible, instant monotone)
+CHANNEL_TITLE_TTL = 600
+channel_titles = {}
+
+async def get_channel_title(channel_id: int):
+    """Titre du canal (None si inaccessible), mis en cache CHANNEL_TITLE_TTL secondes."""
+    cached = channel_titles.get(channel_id)
+    if cached is not None and monotonic() - cached[1] < CHANNEL_TITLE_TTL:
+        return cached[0]
     
-    if not DYNAMIC_PREDICTION_CHANNELS:
+    try:
+        entity = await client.get_entity(channel_id)
+        title = getattr(entity, 'title', 'Inconnu')
+    except Exception:
+        title = None
+    channel_titles[channel_id] = (title, monotonic())
+    return title
+
+BREAKER_ICONS = {'closed': "✅", 'open': "⛔", 'half-open': "🟡"}
+
+def is_channel_in_use(channel_id: int) -> bool:
+    return any(channel_id in engine.channels for engine in ENGINES.values())
+
+async def cmd_channels(event):
+    engine = selected_engine()
+    channels = engine.channels
+    if not channels:
         await event.respond("📭 Aucun canal")
         return
     
-    lines = [f"📡 **Canaux ({len(DYNAMIC_PREDICTION_CHANNELS)}/20)**\n"]
+    lines = [f"📡 **Canaux ({len(channels)}/20)**{source_tag(engine)}\n"]
+    titles = await asyncio.gather(*(get_channel_title(c) for c in channels))
     
-    for i, channel_id in enumerate(DYNAMIC_PREDICTION_CHANNELS, 1):
-        status = "❓"
-        try:
-            entity = await client.get_entity(channel_id)
-            status = "✅"
-            title = getattr(entity, 'title', 'Inconnu')
-            lines.append(f"{i}. `{channel_id}` {status} {title}")
-        except:
-            lines.append(f"{i}. `{channel_id}` {status} (inaccessible)")
+    for i, (channel_id, title) in enumerate(zip(channels, titles), 1):
+        health = channel_breaker.describe(channel_id)
+        if title is None:
+            status, title = "❓", "(inaccessible)"
+        else:
+            status = BREAKER_ICONS[health['state']]
+        line = f"{i}. `{channel_id}` {status} {title}"
+        if health['state'] != 'closed':
+            line += f" — {health['failures']} échecs, réessai dans {health['retry_in']:.0f}s"
+        lines.append(line)
     
     await event.respond("\n".join(lines))
 
-@client.on(events.NewMessage(pattern='/addchannel'))
 async def cmd_addchannel(event):
-    global DYNAMIC_PREDICTION_CHANNELS
-    
-    if event.is_group or event.is_channel:
-        return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
-        await event.respond("⛔ Admin uniquement")
-        return
+    engine = selected_engine()
     
     parts = event.message.message.split()
     if len(parts) < 2:
@@ -636,28 +1102,27 @@ async def cmd_addchannel(event):
     try:
         new_channel_id = int(parts[1])
         
-        if new_channel_id in DYNAMIC_PREDICTION_CHANNELS:
+        if new_channel_id in engine.channels:
             await event.respond(f"⚠️ Déjà présent")
             return
         
-        if len(DYNAMIC_PREDICTION_CHANNELS) >= 20:
+        if len(engine.channels) >= 20:
             await event.respond(f"❌ Limite 20 atteinte")
             return
         
-        try:
-            entity = await client.get_entity(new_channel_id)
-            title = getattr(entity, 'title', 'Inconnu')
-        except Exception as e:
-            title = "Inaccessible"
+        channel_titles.pop(new_channel_id, None)
+        title = await get_channel_title(new_channel_id) or "Inaccessible"
         
-        DYNAMIC_PREDICTION_CHANNELS.append(new_channel_id)
+        if not is_channel_in_use(new_channel_id):
+            channel_breaker.forget(new_channel_id)
+        engine.channels.append(new_channel_id)
         save_dynamic_channels()
         
         await event.respond(
-            f"✅ Canal ajouté!\n"
+            f"✅ Canal ajouté!{source_tag(engine)}\n"
             f"🆔 `{new_channel_id}`\n"
             f"📛 {title}\n"
-            f"📊 Total: {len(DYNAMIC_PREDICTION_CHANNELS)}/20"
+            f"📊 Total: {len(engine.channels)}/20"
         )
         
         try:
@@ -672,15 +1137,8 @@ async def cmd_addchannel(event):
     except Exception as e:
         await event.respond(f"❌ Erreur: {str(e)[:100]}")
 
-@client.on(events.NewMessage(pattern='/removechannel'))
 async def cmd_removechannel(event):
-    global DYNAMIC_PREDICTION_CHANNELS
-    
-    if event.is_group or event.is_channel:
-        return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
-        await event.respond("⛔ Admin uniquement")
-        return
+    engine = selected_engine()
     
     parts = event.message.message.split()
     if len(parts) < 2:
@@ -690,17 +1148,20 @@ async def cmd_removechannel(event):
     try:
         channel_id_to_remove = int(parts[1])
         
-        if channel_id_to_remove not in DYNAMIC_PREDICTION_CHANNELS:
+        if channel_id_to_remove not in engine.channels:
             await event.respond(f"⚠️ Non trouvé")
             return
         
-        DYNAMIC_PREDICTION_CHANNELS.remove(channel_id_to_remove)
+        engine.channels.remove(channel_id_to_remove)
         save_dynamic_channels()
+        if not is_channel_in_use(channel_id_to_remove):
+            channel_breaker.forget(channel_id_to_remove)
+            channel_titles.pop(channel_id_to_remove, None)
         
         await event.respond(
-            f"✅ Canal retiré!\n"
+            f"✅ Canal retiré!{source_tag(engine)}\n"
             f"🆔 `{channel_id_to_remove}`\n"
-            f"📊 Total: {len(DYNAMIC_PREDICTION_CHANNELS)}"
+            f"📊 Total: {len(engine.channels)}"
         )
         
     except ValueError:
@@ -708,49 +1169,30 @@ async def cmd_removechannel(event):
     except Exception as e:
         await event.respond(f"❌ Erreur: {str(e)[:100]}")
 
-@client.on(events.NewMessage(pattern='/histo'))
 async def cmd_histo(event):
-    if event.is_group or event.is_channel:
-        return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
-        return
-    
-    if not games_history:
+    engine = selected_engine()
+    if not engine.history:
         await event.respond("📭 Vide")
         return
     
-    sorted_games = sorted(games_history.items(), key=lambda x: x[0])[-20:]
-    
-    lines = ["📜 **20 derniers jeux (G)**\n"]
-    for num, data in sorted_games:
-        emoji = "🔵" if data['is_even'] else "🔴"
-        lines.append(f"#{num}:G{data['G_value']}{emoji}")
-    
-    even_pos = [i for i, (_, d) in enumerate(sorted_games) if d['is_even']]
-    odd_pos = [i for i, (_, d) in enumerate(sorted_games) if not d['is_even']]
-    
-    even_gaps = [even_pos[i]-even_pos[i-1] for i in range(1, len(even_pos))] if len(even_pos) > 1 else []
-    odd_gaps = [odd_pos[i]-odd_pos[i-1] for i in range(1, len(odd_pos))] if len(odd_pos) > 1 else []
+    lines = [f"📜 **20 derniers jeux (G)**{source_tag(engine)}\n"]
+    for num, G_value, is_even_result in engine.history.last(20):
+        emoji = "🔵" if is_even_result else "🔴"
+        lines.append(f"#{num}:G{G_value}{emoji}")
     
-    even_max = max(even_gaps) if even_gaps else 0
-    odd_max = max(odd_gaps) if odd_gaps else 0
+    gap_window = engine.gap_window
+    even_max = gap_window.max_even_gap or 0
+    odd_max = gap_window.max_odd_gap or 0
     
-    even_thr, odd_thr = get_current_thresholds()
+    even_thr, odd_thr = engine.get_current_thresholds()
     
-    lines.append(f"\n📊 Écarts observés: 🔵{even_max} 🔴{odd_max}")
-    lines.append(f"{'🤖' if auto_mode else '👤'} Seuils actifs: 🔵{even_thr} 🔴{odd_thr}")
+    lines.append(f"\n📊 Écarts observés ({len(gap_window)} jeux): 🔵{even_max} 🔴{odd_max}")
+    lines.append(f"{'🤖' if engine.auto_mode else '👤'} Seuils actifs: 🔵{even_thr} 🔴{odd_thr}")
     
     await event.respond("\n".join(lines))
 
-@client.on(events.NewMessage(pattern='/setmode'))
 async def cmd_setmode(event):
-    global auto_mode, initial_analysis_done
-    
-    if event.is_group or event.is_channel:
-        return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
-        await event.respond("⛔ Admin uniquement")
-        return
+    engine = selected_engine()
     
     parts = event.message.message.split()
     if len(parts) < 2:
@@ -760,36 +1202,31 @@ async def cmd_setmode(event):
     mode = parts[1].lower()
     
     if mode == 'auto':
-        auto_mode = True
-        initial_analysis_done = False
-        calculate_gap_stats_from_window()
+        engine.auto_mode = True
+        engine.initial_analysis_done = False
+        engine.calculate_gap_stats_from_window()
+        log_state_fields(engine)
         await event.respond(
-            f"✅ Mode **AUTO** activé\n"
-            f"📊 Écarts calculés: P={auto_even_gap} I={auto_odd_gap}\n"
+            f"✅ Mode **AUTO** activé{source_tag(engine)}\n"
+            f"📊 Écarts calculés: P={engine.auto_even_gap} I={engine.auto_odd_gap}\n"
             f"🤖 Le bot calcule automatiquement les écarts sur G"
         )
         
     elif mode == 'manual':
-        auto_mode = False
-        initial_analysis_done = True
+        engine.auto_mode = False
+        engine.initial_analysis_done = True
+        log_state_fields(engine)
         await event.respond(
-            f"✅ Mode **MANUEL** activé\n"
-            f"📊 Écarts manuels: P={manual_even_gap} I={manual_odd_gap}\n"
+            f"✅ Mode **MANUEL** activé{source_tag(engine)}\n"
+            f"📊 Écarts manuels: P={engine.manual_even_gap} I={engine.manual_odd_gap}\n"
             f"👤 Utilisez `/setgap pair <n>` et `/setgap impair <n>`\n"
             f"❌ Le bot NE calcule PLUS automatiquement les écarts"
         )
     else:
         await event.respond("❌ Mode invalide. Utilisez `auto` ou `manual`")
 
-@client.on(events.NewMessage(pattern='/setgap'))
 async def cmd_setgap(event):
-    global manual_even_gap, manual_odd_gap
-    
-    if event.is_group or event.is_channel:
-        return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
-        await event.respond("⛔ Admin uniquement")
-        return
+    engine = selected_engine()
     
     parts = event.message.message.split()
     if len(parts) < 3:
@@ -807,18 +1244,20 @@ async def cmd_setgap(event):
         return
     
     if gap_type == 'pair':
-        manual_even_gap = gap_value
-        msg = f"✅ Écart PAIR manuel: **{gap_value}**"
-        if auto_mode:
+        engine.manual_even_gap = gap_value
+        log_state_fields(engine)
+        msg = f"✅ Écart PAIR manuel: **{gap_value}**{source_tag(engine)}"
+        if engine.auto_mode:
             msg += f"\n⚠️ Mode AUTO actif - Passez en manuel: `/setmode manual`"
         else:
             msg += f"\n👤 Mode MANUEL - Seuil actif: {gap_value - 1} consécutifs"
         await event.respond(msg)
         
     elif gap_type == 'impair':
-        manual_odd_gap = gap_value
-        msg = f"✅ Écart IMPAIR manuel: **{gap_value}**"
-        if auto_mode:
+        engine.manual_odd_gap = gap_value
+        log_state_fields(engine)
+        msg = f"✅ Écart IMPAIR manuel: **{gap_value}**{source_tag(engine)}"
+        if engine.auto_mode:
             msg += f"\n⚠️ Mode AUTO actif - Passez en manuel: `/setmode manual`"
         else:
             msg += f"\n👤 Mode MANUEL - Seuil actif: {gap_value - 1} consécutifs"
@@ -826,82 +1265,322 @@ async def cmd_setgap(event):
     else:
         await event.respond("❌ Type invalide. Utilisez `pair` ou `impair`")
 
-@client.on(events.NewMessage(pattern='/stats'))
-async def cmd_stats(event):
-    if event.is_group or event.is_channel:
+def strategy_label(engine: SourceEngine) -> str:
+    return engine.strategy or f"seuils ({'auto' if engine.auto_mode else 'manuel'})"
+
+async def cmd_strategies(event):
+    engine = selected_engine()
+    lines = [f"🧪 **Stratégies fantômes**{source_tag(engine)}\n",
+             f"📢 Publiée: `{strategy_label(engine)}`\n"]
+    
+    for name, ledger in engine.shadow.summary().items():
+        marker = "📢" if name == engine.strategy else "👻"
+        lines.append(
+            f"{marker} `{name}` — ✅ {ledger['won']} ❌ {ledger['lost']} | "
+            f"{ledger['win_rate']:.1f}% | pertes max: {ledger['longest_losing_run']}\n"
+            f"   {ledger['description']}"
+        )
+    
+    lines.append("\n`/strategy <nom>` pour publier une stratégie, `/strategy seuils` pour revenir aux seuils")
+    await event.respond("\n".join(lines))
+
+async def cmd_strategy(event):
+    engine = selected_engine()
+    
+    parts = event.message.message.split()
+    if len(parts) < 2:
+        await event.respond(f"📢 Stratégie publiée: `{strategy_label(engine)}`\n"
+                            f"Usage: `/strategy <nom>` (voir `/strategies`)")
         return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
+    
+    name = parts[1].lower()
+    if name == 'seuils':
+        engine.strategy = None
+    elif name in engine.shadow.strategies:
+        engine.strategy = name
+    else:
+        await event.respond("❌ Stratégie inconnue (voir `/strategies`)")
         return
     
-    win_rate = (total_predictions_won / total_predictions_made * 100) if total_predictions_made > 0 else 0
+    log_state_fields(engine)
+    await event.respond(f"✅ Stratégie publiée: `{strategy_label(engine)}`{source_tag(engine)}")
+
+async def cmd_stats(event):
+    engine = selected_engine()
+    made = engine.total_predictions_made
+    win_rate = (engine.total_predictions_won / made * 100) if made > 0 else 0
     
-    even_thr, odd_thr = get_current_thresholds()
+    even_thr, odd_thr = engine.get_current_thresholds()
     
     msg = (
-        f"📈 **Statistiques (sur G)**\n\n"
-        f"🎮 Jeux analysés: {len(games_history)}\n"
-        f"🔵 Pairs: {total_even_count} | 🔴 Impairs: {total_odd_count}\n\n"
-        f"⚙️ Mode: {'🤖 AUTO' if auto_mode else '👤 MANUEL'}\n"
+        f"📈 **Statistiques (sur G)**{source_tag(engine)}\n\n"
+        f"🎮 Jeux analysés: {len(engine.history)}\n"
+        f"🔵 Pairs: {engine.total_even_count} | 🔴 Impairs: {engine.total_odd_count}\n\n"
+        f"⚙️ Mode: {'🤖 AUTO' if engine.auto_mode else '👤 MANUEL'}\n"
         f"📊 Seuils actifs: P={even_thr} I={odd_thr}\n\n"
         f"🔮 Prédictions:\n"
-        f"• Total: {total_predictions_made}\n"
-        f"• ✅ Gagnées: {total_predictions_won}\n"
-        f"• ❌ Perdues: {total_predictions_lost}\n"
+        f"• Total: {made}\n"
+        f"• ✅ Gagnées: {engine.total_predictions_won}\n"
+        f"• ❌ Perdues: {engine.total_predictions_lost}\n"
         f"• 📊 Taux: {win_rate:.1f}%"
     )
+    
+    archive = engine.archive
+    if len(archive):
+        outcomes = archive.outcomes()
+        long_rate = outcomes.mean() * 100 if len(outcomes) else 0
+        msg += (f"\n\n🗄️ Archive: {len(archive)} jeux | {len(outcomes)} prédictions "
+                f"({long_rate:.1f}%)\n"
+                f"`/runs` `/gaps` `/gfreq` `/winrate` pour le détail")
     await event.respond(msg)
 
-@client.on(events.NewMessage(pattern='/reset'))
-async def cmd_reset(event):
-    if event.is_group or event.is_channel:
+# --- Analyses longue durée ---
+
+def parse_count_arg(event, default=None):
+    """Argument numérique optionnel d'une commande (None si absent, ValueError si invalide)."""
+    parts = event.message.message.split()
+    if len(parts) < 2:
+        return default
+    value = int(parts[1])
+    if value <= 0:
+        raise ValueError(value)
+    return value
+
+def format_histogram(histogram: dict, limit: int = 15) -> str:
+    items = sorted(histogram.items())[:limit]
+    return ' '.join(f"{value}:{count}" for value, count in items) or '-'
+
+def archive_parities(engine: SourceEngine, games: int = None):
+    g_values = engine.archive.g_values(games)
+    return g_values, (g_values % 2) == 0
+
+async def cmd_runs(event):
+    engine = selected_engine()
+    try:
+        games = parse_count_arg(event)
+    except ValueError:
+        await event.respond("❌ Usage: `/runs [nombre de jeux]`")
+        return
+    
+    g_values, parities = archive_parities(engine, games)
+    if not len(g_values):
+        await event.respond("📭 Archive vide")
+        return
+    
+    runs = run_lengths(parities)
+    current = runs['current']
+    await event.respond(
+        f"📏 **Séries sur {len(g_values)} jeux**{source_tag(engine)}\n\n"
+        f"🔵 {format_histogram(runs['even'])}\n"
+        f"🔴 {format_histogram(runs['odd'])}\n\n"
+        f"En cours: {'🔵' if current['parity'] == 'even' else '🔴'} {current['length']}"
+    )
+
+async def cmd_gaps(event):
+    engine = selected_engine()
+    try:
+        games = parse_count_arg(event)
+    except ValueError:
+        await event.respond("❌ Usage: `/gaps [nombre de jeux]`")
         return
-    if event.sender_id != ADMIN_ID and ADMIN_ID != 0:
+    
+    g_values, parities = archive_parities(engine, games)
+    if not len(g_values):
+        await event.respond("📭 Archive vide")
         return
     
-    await perform_reset("Manuel par admin")
-    await event.respond("✅ Reset effectué")
+    gaps = gap_distribution(parities)
+    await event.respond(
+        f"↔️ **Écarts sur {len(g_values)} jeux**{source_tag(engine)}\n\n"
+        f"🔵 {format_histogram(gaps['even'])}\n"
+        f"🔴 {format_histogram(gaps['odd'])}"
+    )
 
-# --- Tâches Automatiques ---
+async def cmd_gfreq(event):
+    engine = selected_engine()
+    try:
+        games = parse_count_arg(event)
+    except ValueError:
+        await event.respond("❌ Usage: `/gfreq [nombre de jeux]`")
+        return
+    
+    g_values = engine.archive.g_values(games)
+    if not len(g_values):
+        await event.respond("📭 Archive vide")
+        return
+    
+    lines = [f"🔢 **Fréquence des G sur {len(g_values)} jeux**{source_tag(engine)}\n"]
+    for value, count in sorted(g_frequency(g_values).items()):
+        lines.append(f"G{value} {'🔵' if is_even(value) else '🔴'}: {count} ({count / len(g_values) * 100:.1f}%)")
+    await event.respond("\n".join(lines))
 
-async def perform_reset(reason: str = "Automatique"):
-    global games_history, pending_predictions, pending_finalization
-    global current_even_streak, current_odd_streak, initial_analysis_done
-    global total_even_count, total_odd_count, total_predictions_made
-    global total_predictions_won, total_predictions_lost, last_game_number, last_G_value
+async def cmd_winrate(event):
+    engine = selected_engine()
+    try:
+        window = parse_count_arg(event, 50)
+    except ValueError:
+        await event.respond("❌ Usage: `/winrate [fenêtre]`")
+        return
+    
+    rate = rolling_win_rate(engine.archive.outcomes(), window)
+    if rate['current'] is None:
+        await event.respond(f"📭 Pas assez de prédictions ({rate['predictions']}/{window})")
+        return
     
-    logger.warning(f"🚨 RESET: {reason}")
+    await event.respond(
+        f"📊 **Taux glissant sur {window} prédictions**{source_tag(engine)}\n\n"
+        f"Actuel: {rate['current']:.1f}%\n"
+        f"Min: {rate['min']:.1f}% | Max: {rate['max']:.1f}%\n"
+        f"Prédictions archivées: {rate['predictions']}"
+    )
+
+async def cmd_days(event):
+    engine = selected_engine()
+    try:
+        count = parse_count_arg(event, 7)
+    except ValueError:
+        await event.respond("❌ Usage: `/days [nombre de journées]`")
+        return
     
-    games_history.clear()
-    pending_predictions.clear()
-    pending_finalization.clear()
-    current_even_streak = current_odd_streak = 0
-    total_even_count = total_odd_count = 0
-    total_predictions_made = total_predictions_won = total_predictions_lost = 0
-    last_game_number = last_G_value = 0
-    initial_analysis_done = False
+    if not game_store.running:
+        await event.respond("📭 Base non disponible")
+        return
+    days = await asyncio.to_thread(game_store.days, engine.source_id, count)
+    if not days:
+        await event.respond("📭 Aucune journée enregistrée")
+        return
     
-    await notify_admin(f"🚨 **RESET EFFECTUÉ**\nRaison: {reason}")
+    lines = [f"📅 **Journées**{source_tag(engine)}\n"]
+    for day in days:
+        settled = day['won'] + day['lost']
+        rate = f" ({day['won'] / settled * 100:.0f}%)" if settled else ""
+        lines.append(f"{day['day']}: {day['games']} jeux 🔵{day['even']} 🔴{day['games'] - day['even']} | "
+                     f"✅{day['won']} ❌{day['lost']}{rate}")
+    await event.respond("\n".join(lines))
+
+async def cmd_reset(event):
+    engine = selected_engine()
+    await perform_reset("Manuel par admin", engine)
+    await event.respond(f"✅ Reset effectué{source_tag(engine)}")
+
+# --- Routeur de Commandes ---
+
+ADMIN_ONLY_MSG = "⛔ Admin uniquement"
+
+# commande -> (gestionnaire, réservée à l'admin, réponse si refusée)
+COMMANDS = {
+    '/start': (cmd_start, False, None),
+    '/sources': (cmd_sources, True, None),
+    '/source': (cmd_source, True, ADMIN_ONLY_MSG),
+    '/status': (cmd_status, True, None),
+    '/info': (cmd_info, True, None),
+    '/channels': (cmd_channels, True, ADMIN_ONLY_MSG),
+    '/addchannel': (cmd_addchannel, True, ADMIN_ONLY_MSG),
+    '/removechannel': (cmd_removechannel, True, ADMIN_ONLY_MSG),
+    '/histo': (cmd_histo, True, None),
+    '/setmode': (cmd_setmode, True, ADMIN_ONLY_MSG),
+    '/setgap': (cmd_setgap, True, ADMIN_ONLY_MSG),
+    '/strategies': (cmd_strategies, True, None),
+    '/strategy': (cmd_strategy, True, ADMIN_ONLY_MSG),
+    '/stats': (cmd_stats, True, None),
+    '/runs': (cmd_runs, True, None),
+    '/gaps': (cmd_gaps, True, None),
+    '/gfreq': (cmd_gfreq, True, None),
+    '/winrate': (cmd_winrate, True, None),
+    '/days': (cmd_days, True, None),
+    '/reset': (cmd_reset, True, None),
+}
+
+def is_command_message(event) -> bool:
+    return event.is_private and event.message.message.startswith('/')
+
+@client.on(events.NewMessage(func=is_command_message))
+async def handle_command(event):
+    """
+    Point d'entrée unique des commandes (conversations privées uniquement).
+    Le premier mot (sans @nom_du_bot) est cherché dans COMMANDS.
+    """
+    try:
+        command = event.message.message.split(maxsplit=1)[0].split('@', 1)[0]
+        entry = COMMANDS.get(command)
+        if entry is None:
+            return
+        
+        handler, admin_only, denied_msg = entry
+        if admin_only and event.sender_id != ADMIN_ID and ADMIN_ID != 0:
+            if denied_msg:
+                await event.respond(denied_msg)
+            return
+        
+        await handler(event)
+    except Exception as e:
+        logger.error(f"Erreur commande: {e}")
+
+# --- Tâches Automatiques ---
+
+def reset_engine_state(engine: SourceEngine = None):
+    """Remet à zéro une source (toutes si engine est None)."""
+    mark_state_changed()
+    engines = ENGINES.values() if engine is None else (engine,)
+    for target in engines:
+        target.reset()
+    
+    if engine is None:
+        prediction_deadlines.clear()
+    else:
+        prediction_deadlines[:] = [entry for entry in prediction_deadlines if entry[1] != engine.source_id]
+        heapq.heapify(prediction_deadlines)
+    deadline_wakeup.set()
+
+async def perform_reset(reason: str = "Automatique", engine: SourceEngine = None):
+    tag = source_tag(engine) if engine is not None else ""
+    logger.warning(f"🚨 RESET{tag}: {reason}")
+    
+    reset_engine_state(engine)
+    # Le journal garde la trace du reset: si l'arrêt survient entre l'écriture de
+    # l'instantané et le vidage du journal, le rejeu se termine par ce reset
+    for target in (ENGINES.values() if engine is None else (engine,)):
+        log_state(target, {'t': 'reset'})
+    take_state_snapshot()
+    
+    notify_admin(f"🚨 **RESET EFFECTUÉ**{tag}\nRaison: {reason}")
     logger.warning("✅ Reset terminé")
 
+def is_deadline_active(deadline: float, source_id: int, game_num: int) -> bool:
+    engine = ENGINES.get(source_id)
+    pred = engine.pending_predictions.get(game_num) if engine is not None else None
+    return (pred is not None and pred.get('deadline') == deadline
+            and pred['status'] in ['⏳', '🔮'])
+
 async def check_prediction_timeouts():
+    """
+    Dort jusqu'à la prochaine échéance de prédiction (aucun réveil sans prédiction active).
+    Les échéances de prédictions déjà terminées sont retirées du tas au réveil.
+    Un timeout ne remet à zéro que la source concernée.
+    """
     while True:
         try:
-            await asyncio.sleep(60)
+            while prediction_deadlines and not is_deadline_active(*prediction_deadlines[0]):
+                heapq.heappop(prediction_deadlines)
             
-            now = datetime.now()
-            expired = []
+            deadline_wakeup.clear()
             
-            for game_num, pred in pending_predictions.items():
-                if pred['status'] not in ['⏳', '🔮']:
-                    continue
-                    
-                created = datetime.fromisoformat(pred['created_at'])
-                if now - created > timedelta(minutes=PREDICTION_TIMEOUT_MINUTES):
-                    expired.append(game_num)
+            if not prediction_deadlines:
+                await deadline_wakeup.wait()
+                continue
             
-            if expired:
-                logger.warning(f"🚨 {len(expired)} prédiction(s) en timeout!")
-                await perform_reset(f"Timeout après {PREDICTION_TIMEOUT_MINUTES}min")
+            deadline, source_id, game_num = prediction_deadlines[0]
+            delay = deadline - monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(deadline_wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heapq.heappop(prediction_deadlines)
+            logger.warning(f"🚨 [{source_id}] Prédiction #{game_num} en timeout!")
+            await perform_reset(f"Timeout après {PREDICTION_TIMEOUT_MINUTES}min", ENGINES[source_id])
                 
         except Exception as e:
             logger.error(f"Erreur timeout check: {e}")
@@ -924,39 +1603,298 @@ async def schedule_daily_reset():
 
 # --- Serveur Web ---
 
-async def index(request):
-    even_thr, odd_thr = get_current_thresholds()
+class CachedPage:
+    __slots__ = ('version', 'body', 'gzip_body', 'etag', 'gzip_etag', 'content_type')
     
-    html = f"""<!DOCTYPE html>
+    def __init__(self, version: int, body: bytes, content_type: str):
+        self.version = version
+        self.body = body
+        self.gzip_body = gzip.compress(body)
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        # Un validateur fort distinct par codage de contenu
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+        self.content_type = content_type
+
+# Pages rendues une seule fois par version de l'état: nom -> CachedPage
+page_cache = {}
+
+def cached_response(request, name: str, render, content_type: str):
+    """
+    Sert une page depuis le cache (rendue à nouveau seulement si l'état a changé),
+    avec ETag / 304 et compression gzip.
+    """
+    page = page_cache.get(name)
+    if page is None or page.version != state_version:
+        page = CachedPage(state_version, render().encode('utf-8'), content_type)
+        page_cache[name] = page
+    
+    use_gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
+    etag = page.gzip_etag if use_gzip else page.etag
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if etag in request.headers.get('If-None-Match', ''):
+        return web.Response(status=304, headers=headers)
+    
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+        return web.Response(body=page.gzip_body, content_type=page.content_type, charset='utf-8', headers=headers)
+    return web.Response(body=page.body, content_type=page.content_type, charset='utf-8', headers=headers)
+
+def source_state(engine: SourceEngine) -> dict:
+    even_thr, odd_thr = engine.get_current_thresholds()
+    total_checked = engine.total_predictions_won + engine.total_predictions_lost
+    return {
+        'source_id': engine.source_id,
+        'last_game_number': engine.last_game_number,
+        'last_G_value': engine.last_G_value,
+        'auto_mode': engine.auto_mode,
+        'thresholds': {'even': even_thr, 'odd': odd_thr},
+        'manual_gaps': {'even': engine.manual_even_gap, 'odd': engine.manual_odd_gap},
+        'auto_gaps': {'even': engine.auto_even_gap, 'odd': engine.auto_odd_gap},
+        'streaks': {'even': engine.current_even_streak, 'odd': engine.current_odd_streak},
+        'games': {'history': len(engine.history), 'even': engine.total_even_count,
+                  'odd': engine.total_odd_count, 'pending_finalization': len(engine.pending_finalization)},
+        'predictions': {
+            'made': engine.total_predictions_made,
+            'won': engine.total_predictions_won,
+            'lost': engine.total_predictions_lost,
+            'win_rate': round(engine.total_predictions_won / total_checked * 100, 2) if total_checked else 0,
+            'active': [
+                {'game_number': n, 'prediction': p['prediction'], 'status': p['status'],
+                 'checked_games': p['checked_games']}
+                for n, p in engine.pending_predictions.items()
+            ],
+        },
+        'channels': len(engine.channels),
+        'strategy': engine.strategy,
+        'shadow': engine.shadow.summary(),
+    }
+
+def render_state() -> str:
+    return json.dumps({
+        'sources': [source_state(engine) for engine in ENGINES.values()],
+    }, ensure_ascii=False)
+
+def render_source_box(engine: SourceEngine) -> str:
+    even_thr, odd_thr = engine.get_current_thresholds()
+    return f"""
+        <div class="box">
+            <p>📡 Source: {engine.source_id}</p>
+            <p>Dernier: #{engine.last_game_number}</p>
+            <p>Dernier G: {engine.last_G_value} ({'Pair' if is_even(engine.last_G_value) else 'Impair'})</p>
+            <p>Mode: {'🤖 AUTO' if engine.auto_mode else '👤 MANUEL'}</p>
+            <p>Seuils: P={even_thr} I={odd_thr}</p>
+            <p>Canaux: {len(engine.channels)}</p>
+            <p>Actives: {engine.active_prediction_count}</p>
+        </div>"""
+
+def render_dashboard() -> str:
+    boxes = ''.join(render_source_box(engine) for engine in ENGINES.values())
+    
+    return f"""<!DOCTYPE html>
     <html>
     <head><title>Bot Prédiction G</title>
     <style>
         body {{ font-family: Arial; max-width: 600px; margin: 50px auto; padding: 20px; }}
-        .box {{ background: #f0f0f0; padding: 20px; border-radius: 10px; }}
+        .box {{ background: #f0f0f0; padding: 20px; border-radius: 10px; margin-bottom: 15px; }}
     </style>
     </head>
     <body>
         <h1>🎯 Bot Prédiction (sur G)</h1>
-        <div class="box">
-            <p>✅ En ligne</p>
-            <p>Dernier: #{last_game_number}</p>
-            <p>Dernier G: {last_G_value} ({'Pair' if is_even(last_G_value) else 'Impair'})</p>
-            <p>Mode: {'🤖 AUTO' if auto_mode else '👤 MANUEL'}</p>
-            <p>Seuils: P={even_thr} I={odd_thr}</p>
-            <p>Canaux: {len(DYNAMIC_PREDICTION_CHANNELS)}</p>
-            <p>Actives: {len([p for p in pending_predictions.values() if p['status'] in ['⏳', '🔮']])}</p>
-        </div>
+        <p>✅ En ligne</p>{boxes}
     </body>
     </html>"""
-    return web.Response(text=html, content_type='text/html')
+
+# --- Flux en direct (SSE) ---
+
+STREAM_CLIENT_BUFFER = 100  # Événements en attente par client avant déconnexion
+STREAM_KEEPALIVE_SECONDS = 15
+
+# Files d'envoi des clients /events connectés
+stream_clients = set()
+stream_event_id = 0
+
+def publish_stream_event(kind: str, data: dict):
+    """
+    Diffuse un événement du moteur aux clients SSE. Sérialisé une seule fois;
+    un client dont la file est pleine (trop lent) est déconnecté.
+    """
+    global stream_event_id
+    
+    if not stream_clients:
+        return
+    
+    stream_event_id += 1
+    payload = f"id: {stream_event_id}\nevent: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8')
+    
+    for client_queue in list(stream_clients):
+        try:
+            client_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            stream_clients.discard(client_queue)
+            while not client_queue.empty():
+                client_queue.get_nowait()
+            client_queue.put_nowait(None)
+
+event_listeners.append(publish_stream_event)
+
+async def event_stream(request):
+    """Flux SSE des jeux enregistrés, nouvelles prédictions et résultats."""
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    await response.prepare(request)
+    
+    client_queue = asyncio.Queue(maxsize=STREAM_CLIENT_BUFFER)
+    stream_clients.add(client_queue)
+    try:
+        await response.write(b": connected\n\n")
+        while True:
+            try:
+                payload = await asyncio.wait_for(client_queue.get(), STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                await response.write(b": ping\n\n")
+                continue
+            if payload is None:
+                logger.warning("⚠️ Client /events trop lent, déconnecté")
+                break
+            await response.write(payload)
+    except ConnectionResetError:
+        pass
+    finally:
+        # Aussi à l'annulation (déconnexion, arrêt du serveur), qui est propagée
+        stream_clients.discard(client_queue)
+    return response
+
+async def index(request):
+    return cached_response(request, 'index', render_dashboard, 'text/html')
+
+async def api_state(request):
+    return cached_response(request, 'state', render_state, 'application/json')
+
+async def api_channels(request):
+    """
+    État des disjoncteurs des canaux de prédiction, par source. Hors cache:
+    le délai avant réessai et le passage en semi-ouvert dépendent de l'heure.
+    """
+    return web.json_response({
+        str(engine.source_id): {str(c): channel_breaker.describe(c) for c in engine.channels}
+        for engine in ENGINES.values()
+    })
 
 async def health_check(request):
     return web.Response(text="OK")
 
+async def debug_traces(request):
+    """Traces récentes: ?limit=50&min_ms=0&game=<numéro>&source=<id>"""
+    try:
+        limit = int(request.query.get('limit', 50))
+        min_ms = float(request.query.get('min_ms', 0))
+        game = request.query.get('game')
+        game_number = int(game) if game else None
+        source = request.query.get('source')
+        source = int(source) if source else None
+    except ValueError:
+        return web.json_response({'error': 'paramètre invalide'}, status=400)
+    return web.json_response(TRACES.query(limit, min_ms, game_number, source))
+
+async def api_analytics(request):
+    """Analyses longue durée: ?source=<id>&games=<n>&window=<fenêtre du taux glissant>"""
+    try:
+        source = int(request.query.get('source', PRIMARY_SOURCE))
+        games = request.query.get('games')
+        games = int(games) if games else None
+        window = int(request.query.get('window', 50))
+        if (games is not None and games <= 0) or window <= 0:
+            raise ValueError(games, window)
+    except ValueError:
+        return web.json_response({'error': 'paramètre invalide'}, status=400)
+    
+    engine = ENGINES.get(source)
+    if engine is None:
+        return web.json_response({'error': 'source inconnue'}, status=404)
+    
+    started = monotonic()
+    result = analyse(engine.archive, games, window)
+    result['source_id'] = source
+    result['elapsed_ms'] = round((monotonic() - started) * 1000, 3)
+    return web.json_response(result)
+
+ARCHIVE_QUERY_MAX_ROWS = 10000
+
+def parse_limit(value, default: int) -> int:
+    """Paramètre limit d'une requête sur la base: entre 1 et ARCHIVE_QUERY_MAX_ROWS (ValueError sinon)."""
+    limit = int(value) if value else default
+    if limit < 1:
+        raise ValueError(limit)
+    return min(limit, ARCHIVE_QUERY_MAX_ROWS)
+
+def archive_query(request) -> dict:
+    """Filtres communs des requêtes sur la base: source, day, from, to, limit (ValueError si invalide)."""
+    query = request.query
+    day = query.get('day')
+    if day:
+        datetime.strptime(day, '%Y-%m-%d')
+    return {
+        'source': int(query.get('source', PRIMARY_SOURCE)),
+        'day': day or None,
+        'start': int(query['from']) if query.get('from') else None,
+        'end': int(query['to']) if query.get('to') else None,
+        'limit': parse_limit(query.get('limit'), 1000),
+    }
+
+async def api_games(request):
+    """Jeux archivés: ?source=<id>&day=AAAA-MM-JJ&from=<jeu>&to=<jeu>&limit=<n>"""
+    try:
+        filters = archive_query(request)
+    except ValueError:
+        return web.json_response({'error': 'paramètre invalide'}, status=400)
+    if not game_store.running:
+        return web.json_response({'error': 'base non disponible'}, status=503)
+    return web.json_response(await asyncio.to_thread(game_store.games, **filters))
+
+async def api_predictions(request):
+    """Prédictions archivées: mêmes filtres que /api/games, plus &outcome=won|lost"""
+    try:
+        filters = archive_query(request)
+        outcome = request.query.get('outcome')
+        if outcome:
+            filters['outcome'] = {'won': True, 'lost': False}[outcome]
+    except (ValueError, KeyError):
+        return web.json_response({'error': 'paramètre invalide'}, status=400)
+    if not game_store.running:
+        return web.json_response({'error': 'base non disponible'}, status=503)
+    return web.json_response(await asyncio.to_thread(game_store.predictions, **filters))
+
+async def api_days(request):
+    """Bilan par journée: ?source=<id>&limit=<n>"""
+    try:
+        source = int(request.query.get('source', PRIMARY_SOURCE))
+        limit = parse_limit(request.query.get('limit'), 60)
+    except ValueError:
+        return web.json_response({'error': 'paramètre invalide'}, status=400)
+    if not game_store.running:
+        return web.json_response({'error': 'base non disponible'}, status=503)
+    return web.json_response(await asyncio.to_thread(game_store.days, source, limit))
+
+async def metrics_endpoint(request):
+    return web.Response(text=METRICS.render(), content_type='text/plain')
+
 async def start_web_server():
     app = web.Application()
     app.router.add_get('/', index)
     app.router.add_get('/health', health_check)
+    app.router.add_get('/api/state', api_state)
+    app.router.add_get('/api/channels', api_channels)
+    app.router.add_get('/api/analytics', api_analytics)
+    app.router.add_get('/api/games', api_games)
+    app.router.add_get('/api/predictions', api_predictions)
+    app.router.add_get('/api/days', api_days)
+    app.router.add_get('/events', event_stream)
+    app.router.add_get('/metrics', metrics_endpoint)
+    app.router.add_get('/debug/traces', debug_traces)
     
     runner = web.AppRunner(app)
     await runner.setup()
@@ -967,14 +1905,24 @@ async def start_web_server():
 # --- Démarrage ---
 
 async def start_bot():
-    global source_channel_ok, DYNAMIC_PREDICTION_CHANNELS
+    global source_channel_ok
     
+    os.makedirs(DATA_DIR, exist_ok=True)
     load_dynamic_channels()
+    restore_state()
+    state_store.start()
+    game_store.start()
+    for engine in ENGINES.values():
+        load_archive(engine)
+    take_state_snapshot()
     
     try:
         await client.start(bot_token=BOT_TOKEN)
         source_channel_ok = True
-        logger.info(f"✅ Bot connecté | {len(DYNAMIC_PREDICTION_CHANNELS)} canaux | Analyse sur G")
+        logger.info(f"✅ Bot connecté | {len(ENGINES)} source(s) | "
+                    f"{sum(len(e.channels) for e in ENGINES.values())} canaux | Analyse sur G")
+        await asyncio.gather(*(warm_start(engine) for engine in ENGINES.values()))
+        source_ready.set()
         return True
     except Exception as e:
         logger.error(f"❌ Erreur: {e}")
@@ -989,6 +1937,8 @@ async def main():
         
         asyncio.create_task(schedule_daily_reset())
         asyncio.create_task(check_prediction_timeouts())
+        asyncio.create_task(process_edit_queue())
+        asyncio.create_task(process_admin_notifications())
         
         logger.info("🚀 Bot opérationnel! Analyse basée sur G (point du jour)")
         await client.run_until_disconnected()
@@ -0,0 +1,185 @@
+"""
+Rejoue hors ligne un flux archivé du canal source à travers la logique du bot.
+
+Le flux est un fichier JSONL, une ligne par message ou édition:
+    {"text": "#N1234. ✅8(5♠️3♦️) - 6(A♥️5♣️)", "edit": false}
+
+Les messages passent par process_message / should_predict /
+check_prediction_result de main.py, sur le moteur de la source principale,
+avec un faux client qui enregistre les envois et éditions au lieu d'appeler
+Telegram. Les timeouts de prédiction (horloge réelle) ne sont pas simulés.
+
+Usage: python replay.py flux.jsonl [--manual PAIR IMPAIR] [--strategy NOM] [--shadow]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+# Journaux sur stderr, configurés avant main.py (dont basicConfig écrit sur stdout):
+# stdout ne contient que le résultat JSON
+logging.basicConfig(stream=sys.stderr, level=logging.WARNING)
+
+import main as bot  # noqa: E402
+
+REPLAY_CHANNEL_ID = -1000000000001
+
+
+class FakeMessage:
+    __slots__ = ('id',)
+
+    def __init__(self, msg_id: int):
+        self.id = msg_id
+
+
+class FakeClient:
+    """Enregistre les envois et éditions à la place de Telegram."""
+
+    def __init__(self):
+        self.sent = []
+        self.edits = []
+        self._next_id = 0
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self._next_id += 1
+        self.sent.append((chat_id, self._next_id, text))
+        return FakeMessage(self._next_id)
+
+    async def edit_message(self, chat_id, msg_id, text, **kwargs):
+        self.edits.append((chat_id, msg_id, text))
+
+
+def load_stream(path: str) -> list:
+    """Charge le flux JSONL en liste de (texte, is_edit)."""
+    stream = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            stream.append((entry['text'], bool(entry.get('edit', False))))
+    return stream
+
+
+class ReplayResult:
+    """Bilan des prédictions, tel que produit par update_prediction_status."""
+
+    def __init__(self, prediction_window: int):
+        self.games = 0
+        self.outcomes = []  # True (gagnée) / False (perdue), dans l'ordre
+        self.wins_by_offset = [0] * prediction_window
+        self.sent = 0
+        self.edits = 0
+
+    def on_event(self, kind: str, data: dict):
+        if kind == 'game':
+            self.games += 1
+        elif kind == 'result':
+            self.outcomes.append(data['won'])
+            offset = data['offset']
+            if data['won'] and offset is not None and 0 <= offset < len(self.wins_by_offset):
+                self.wins_by_offset[offset] += 1
+
+    @property
+    def won(self) -> int:
+        return sum(self.outcomes)
+
+    @property
+    def lost(self) -> int:
+        return len(self.outcomes) - self.won
+
+    @property
+    def win_rate(self) -> float:
+        return self.won / len(self.outcomes) * 100 if self.outcomes else 0.0
+
+    @property
+    def longest_losing_run(self) -> int:
+        longest = run = 0
+        for won in self.outcomes:
+            run = 0 if won else run + 1
+            longest = max(longest, run)
+        return longest
+
+    def to_dict(self) -> dict:
+        return {
+            'games': self.games,
+            'predictions': len(self.outcomes),
+            'won': self.won,
+            'lost': self.lost,
+            'win_rate': round(self.win_rate, 2),
+            'longest_losing_run': self.longest_losing_run,
+            'wins_by_offset': {str(i): n for i, n in enumerate(self.wins_by_offset)},
+            'messages_sent': self.sent,
+            'messages_edited': self.edits,
+        }
+
+
+def replay_engine():
+    """Moteur rejoué: celui de la source principale (règles réglables avant le rejeu)."""
+    return bot.ENGINES[bot.PRIMARY_SOURCE]
+
+
+async def reset_engine():
+    """Remet le moteur à zéro avant un rejeu."""
+    engine = replay_engine()
+    await bot.perform_reset("Rejeu", engine)
+    bot.pending_edits.clear()
+    engine.auto_even_gap = engine.auto_odd_gap = 3
+
+
+async def replay(stream: list) -> ReplayResult:
+    engine = replay_engine()
+    fake_client = FakeClient()
+    bot.client = fake_client
+    engine.channels = [REPLAY_CHANNEL_ID]
+    bot.ADMIN_ID = 0  # Pas de notifications admin pendant un rejeu
+
+    await reset_engine()
+
+    result = ReplayResult(engine.prediction_window)
+    bot.event_listeners.append(result.on_event)
+    try:
+        for text, is_edit in stream:
+            await bot.process_message(text, engine.source_id, is_edit)
+            await bot.flush_edit_queue()
+    finally:
+        bot.event_listeners.remove(result.on_event)
+
+    result.sent = sum(1 for chat_id, _, _ in fake_client.sent if chat_id == REPLAY_CHANNEL_ID)
+    result.edits = len(fake_client.edits)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu hors ligne du canal source")
+    parser.add_argument('stream', help="Fichier JSONL des messages du canal source")
+    parser.add_argument('--manual', nargs=2, type=int, metavar=('PAIR', 'IMPAIR'),
+                        help="Mode manuel avec ces écarts (mode auto par défaut)")
+    parser.add_argument('--strategy', help="Stratégie publiée (voir strategies.py), règle des seuils par défaut")
+    parser.add_argument('--shadow', action='store_true', help="Ajoute le bilan des stratégies fantômes")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    engine = replay_engine()
+    if args.manual:
+        engine.auto_mode = False
+        engine.manual_even_gap, engine.manual_odd_gap = args.manual
+    if args.strategy:
+        if args.strategy not in engine.shadow.strategies:
+            parser.error(f"stratégie inconnue: {args.strategy} ({', '.join(engine.shadow.strategies)})")
+        engine.strategy = args.strategy
+
+    stream = load_stream(args.stream)
+    result = asyncio.run(replay(stream)).to_dict()
+    if args.shadow:
+        result['shadow'] = engine.shadow.summary()
+    json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Analyse des messages du canal source en une seule passe.
+
+Format: #Nxxx. [✅]SCORE(cartes) [- / 🔰] [✅]SCORE(cartes)
+Marqueurs de statut: ✅ / 🔰 (finalisé), ⏰ / ▶️ (en cours).
+"""
+
+import re
+
+# Numéro de jeu puis premier score (G), compilés une fois pour toutes
+GAME_RE = re.compile(r"#N\s*(\d+)(?:[^\d]*?(\d+))?", re.IGNORECASE)
+
+
+def parse_status(message: str) -> str:
+    # Les recherches de sous-chaînes restent plus rapides qu'une regex d'emoji
+    if '✅' in message or '🔰' in message:
+        return 'finalized'
+    if '⏰' in message or '▶️' in message:
+        return 'pending'
+    return 'unknown'
+
+
+def parse_source_message(message: str):
+    """
+    Retourne (game_number, G_value, status) ou None si ce n'est pas un message de jeu.
+    G_value vaut None si le score n'est pas trouvé.
+    """
+    if '#' not in message:
+        return None
+
+    match = GAME_RE.search(message)
+    if match is None:
+        return None
+
+    game_number = int(match.group(1))
+    G_text = match.group(2)
+    # G n'est reconnu qu'après un '#N' majuscule
+    if G_text is not None and match.group(0)[1] == 'N':
+        G_value = int(G_text)
+    else:
+        G_value = None
+
+    return game_number, G_value, parse_status(message)
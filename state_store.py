@@ -0,0 +1,84 @@
+"""
+Persistance de l'état du moteur: instantané compact + journal en ajout seul.
+
+Chaque changement d'état est ajouté au journal (une ligne JSON). Un instantané
+complet est écrit périodiquement, après quoi le journal est vidé. Au démarrage,
+l'état = instantané + rejeu du journal. Les écritures sont faites par un thread
+dédié pour ne jamais bloquer la boucle asyncio.
+"""
+
+import json
+import logging
+import os
+
+from background_writer import BackgroundWriter
+
+logger = logging.getLogger(__name__)
+
+
+class StateStore(BackgroundWriter):
+    thread_name = 'state-store'
+    error_message = "Erreur écriture état"
+
+    def __init__(self, snapshot_path: str, wal_path: str):
+        super().__init__()
+        self.snapshot_path = snapshot_path
+        self.wal_path = wal_path
+        self._wal = None
+
+    def load(self) -> tuple:
+        """Retourne (instantané ou None, liste des entrées du journal)."""
+        snapshot = None
+        records = []
+
+        try:
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+        except Exception as e:
+            logger.error(f"Erreur lecture instantané: {e}")
+
+        try:
+            if os.path.exists(self.wal_path):
+                with open(self.wal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            # Dernière ligne tronquée par un arrêt brutal
+                            logger.warning("⚠️ Entrée de journal illisible ignorée")
+        except Exception as e:
+            logger.error(f"Erreur lecture journal: {e}")
+
+        return snapshot, records
+
+    def append(self, record: dict):
+        """Ajoute une entrée au journal (sans effet si le stockage n'est pas démarré)."""
+        self.put('wal', record)
+
+    def snapshot(self, state: dict):
+        """Écrit un instantané complet puis vide le journal."""
+        self.put('snapshot', state)
+
+    def _write_snapshot(self, state: dict):
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def open_writer(self):
+        self._wal = open(self.wal_path, 'a', encoding='utf-8')
+
+    def write_batch(self, items: list):
+        for kind, payload in items:
+            if kind == 'wal':
+                self._wal.write(json.dumps(payload, ensure_ascii=False, separators=(',', ':')) + '\n')
+            else:
+                # Les entrées précédentes (dont un reset) sont écrites avant l'instantané
+                self._wal.flush()
+                self._write_snapshot(payload)
+                self._wal.close()
+                self._wal = open(self.wal_path, 'w', encoding='utf-8')
+        self._wal.flush()
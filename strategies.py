@@ -0,0 +1,303 @@
+"""
+Stratégies de prédiction évaluées en mode fantôme sur chaque jeu finalisé.
+
+Chaque stratégie reçoit les mêmes caractéristiques, calculées une seule fois
+par jeu et partagées (fenêtres d'écarts par taille, série en cours,
+histogramme des longueurs de séries, proportion de pairs par taille de
+fenêtre), et tient un registre virtuel de ses prédictions (gagnées/perdues)
+avec les mêmes règles que les prédictions publiées: une prédiction active à
+la fois, jeu visé = jeu + offset, fenêtre de vérification.
+
+Une seule stratégie publie (voir SourceEngine.decide); les autres ne font
+que tenir leur registre.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+
+from gap_window import GapWindow
+
+
+class ParityCounter:
+    """Nombre de G pairs parmi les `size` derniers jeux."""
+    __slots__ = ('size', 'even', '_recent')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.even = 0
+        self._recent = deque()
+
+    def __len__(self):
+        return len(self._recent)
+
+    def clear(self):
+        self.even = 0
+        self._recent.clear()
+
+    def push(self, is_even_result: bool):
+        self._recent.append(is_even_result)
+        self.even += is_even_result
+        if len(self._recent) > self.size:
+            self.even -= self._recent.popleft()
+
+
+class RunLengths:
+    """Nombre de séries terminées par parité et par longueur."""
+    __slots__ = ('counts',)
+
+    def __init__(self):
+        self.counts = {True: [0], False: [0]}  # parité -> [nb de séries de longueur i]
+
+    def clear(self):
+        self.counts = {True: [0], False: [0]}
+
+    def add(self, is_even_result: bool, length: int):
+        counts = self.counts[is_even_result]
+        if length >= len(counts):
+            counts.extend([0] * (length + 1 - len(counts)))
+        counts[length] += 1
+
+    def ending_probability(self, is_even_result: bool, length: int, min_runs: int):
+        """
+        Proportion des séries ayant atteint `length` qui se sont arrêtées à `length`
+        (None si moins de `min_runs` séries l'ont atteinte).
+        """
+        counts = self.counts[is_even_result]
+        reached = sum(counts[length:])
+        if reached < min_runs:
+            return None
+        return counts[length] / reached if length < len(counts) else 0.0
+
+
+# --- Stratégies ---
+
+class Strategy(ABC):
+    """Règle de prédiction: decide() retourne "PAIR", "IMPAIR" ou None."""
+    name = ''
+    description = ''
+
+    def bind(self, bank: 'StrategyBank'):
+        """Réserve les caractéristiques partagées utilisées par la stratégie."""
+
+    def reset(self):
+        pass
+
+    @abstractmethod
+    def decide(self, bank: 'StrategyBank'):
+        """Décision sur le dernier jeu observé par la banque."""
+
+
+class GapStrategy(Strategy):
+    """Règle des écarts du mode auto, sur une fenêtre de taille donnée."""
+
+    def __init__(self, window: int, gap_min: int = 2, gap_max: int = 8, default_gap: int = 3):
+        self.name = f"gap{window}"
+        self.description = f"Écarts max sur {window} jeux (bornes {gap_min}..{gap_max})"
+        self.window = window
+        self.gap_min = gap_min
+        self.gap_max = gap_max
+        self.default_gap = default_gap
+        self.reset()
+
+    def bind(self, bank):
+        self._gaps = bank.gap_window(self.window)
+
+    def reset(self):
+        self.even_gap = self.odd_gap = self.default_gap
+
+    def decide(self, bank):
+        gaps = self._gaps
+        if len(gaps) < self.window:
+            return None
+
+        if gaps.max_even_gap is not None:
+            self.even_gap = max(self.gap_min, min(gaps.max_even_gap, self.gap_max))
+        if gaps.max_odd_gap is not None:
+            self.odd_gap = max(self.gap_min, min(gaps.max_odd_gap, self.gap_max))
+
+        if bank.run_is_even:
+            return "IMPAIR" if bank.run_length >= self.even_gap - 1 else None
+        return "PAIR" if bank.run_length >= self.odd_gap - 1 else None
+
+
+class RunLengthStrategy(Strategy):
+    """Prédit la fin de la série en cours quand l'historique la rend probable."""
+
+    def __init__(self, min_probability: float = 0.6, min_runs: int = 30):
+        self.name = 'runlength'
+        self.description = f"Fin de série si probabilité ≥ {min_probability:.0%} ({min_runs}+ séries)"
+        self.min_probability = min_probability
+        self.min_runs = min_runs
+
+    def decide(self, bank):
+        if not bank.run_length:
+            return None
+        probability = bank.run_lengths.ending_probability(bank.run_is_even, bank.run_length, self.min_runs)
+        if probability is None or probability < self.min_probability:
+            return None
+        return "IMPAIR" if bank.run_is_even else "PAIR"
+
+
+class FrequencyBalanceStrategy(Strategy):
+    """Prédit la parité sous-représentée sur les derniers jeux (retour à l'équilibre)."""
+
+    def __init__(self, window: int = 50, threshold: float = 0.6):
+        self.name = f"balance{window}"
+        self.description = f"Parité minoritaire si l'autre dépasse {threshold:.0%} sur {window} jeux"
+        self.window = window
+        self.threshold = threshold
+
+    def bind(self, bank):
+        self._counter = bank.parity_counter(self.window)
+
+    def decide(self, bank):
+        counter = self._counter
+        if len(counter) < self.window:
+            return None
+        even_share = counter.even / len(counter)
+        if even_share >= self.threshold:
+            return "IMPAIR"
+        if even_share <= 1 - self.threshold:
+            return "PAIR"
+        return None
+
+
+def default_strategies() -> list:
+    return [
+        GapStrategy(20),
+        GapStrategy(50),
+        GapStrategy(100),
+        RunLengthStrategy(),
+        FrequencyBalanceStrategy(50),
+    ]
+
+
+# --- Registres virtuels ---
+
+class Ledger:
+    """Prédictions virtuelles d'une stratégie."""
+    __slots__ = ('won', 'lost', 'losing_run', 'longest_losing_run', 'wins_by_offset', 'active')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.won = self.lost = 0
+        self.losing_run = self.longest_losing_run = 0
+        self.wins_by_offset = {}
+        self.active = None  # [jeu visé, prédiction, vérifications]
+
+    def settle(self, won: bool, offset: int = None):
+        self.active = None
+        if won:
+            self.won += 1
+            self.wins_by_offset[offset] = self.wins_by_offset.get(offset, 0) + 1
+            self.losing_run = 0
+        else:
+            self.lost += 1
+            self.losing_run += 1
+            self.longest_losing_run = max(self.longest_losing_run, self.losing_run)
+
+    def to_dict(self) -> dict:
+        total = self.won + self.lost
+        return {
+            'won': self.won,
+            'lost': self.lost,
+            'win_rate': round(self.won / total * 100, 2) if total else 0,
+            'longest_losing_run': self.longest_losing_run,
+            'wins_by_offset': {str(k): v for k, v in sorted(self.wins_by_offset.items())},
+            'active': list(self.active) if self.active else None,
+        }
+
+
+class StrategyBank:
+    """
+    Caractéristiques partagées et registres virtuels des stratégies d'une source.
+    observe() coûte O(nombre de stratégies) par jeu.
+    """
+
+    def __init__(self, strategies: list):
+        self._gap_windows = {}
+        self._parity_counters = {}
+        self.run_lengths = RunLengths()
+        self.strategies = {}
+        self.ledgers = {}
+        self.decisions = {}  # Décision de chaque stratégie sur le dernier jeu
+        for strategy in strategies:
+            strategy.bind(self)
+            self.strategies[strategy.name] = strategy
+            self.ledgers[strategy.name] = Ledger()
+        self.reset()
+
+    def gap_window(self, size: int) -> GapWindow:
+        window = self._gap_windows.get(size)
+        if window is None:
+            window = self._gap_windows[size] = GapWindow(size)
+        return window
+
+    def parity_counter(self, size: int) -> ParityCounter:
+        counter = self._parity_counters.get(size)
+        if counter is None:
+            counter = self._parity_counters[size] = ParityCounter(size)
+        return counter
+
+    def reset(self):
+        self.last_game = 0
+        self.run_is_even = None
+        self.run_length = 0
+        self.run_lengths.clear()
+        for window in self._gap_windows.values():
+            window.clear()
+        for counter in self._parity_counters.values():
+            counter.clear()
+        for name, strategy in self.strategies.items():
+            strategy.reset()
+            self.ledgers[name].reset()
+        self.decisions.clear()
+
+    def observe(self, game_number: int, is_even_result: bool, prediction_window: int, target_offset: int):
+        """
+        Met à jour les caractéristiques, règle les prédictions virtuelles couvrant
+        ce jeu, puis fait décider chaque stratégie.
+        Les jeux hors ordre et les éditions sont ignorés.
+        """
+        if game_number <= self.last_game:
+            return
+        self.last_game = game_number
+
+        if is_even_result == self.run_is_even:
+            self.run_length += 1
+        else:
+            if self.run_length:
+                self.run_lengths.add(self.run_is_even, self.run_length)
+            self.run_is_even = is_even_result
+            self.run_length = 1
+        for window in self._gap_windows.values():
+            window.push(is_even_result)
+        for counter in self._parity_counters.values():
+            counter.push(is_even_result)
+
+        decisions = self.decisions
+        for name, strategy in self.strategies.items():
+            ledger = self.ledgers[name]
+            active = ledger.active
+            if active is not None:
+                offset = game_number - active[0]
+                if offset >= prediction_window:
+                    ledger.settle(False)
+                elif offset >= 0:
+                    active[2] += 1
+                    if (active[1] == "PAIR") == is_even_result:
+                        ledger.settle(True, offset)
+                    elif active[2] >= prediction_window:
+                        ledger.settle(False)
+
+            decision = decisions[name] = strategy.decide(self)
+            if decision is not None and ledger.active is None:
+                ledger.active = [game_number + target_offset, decision, 0]
+
+    def summary(self) -> dict:
+        return {
+            name: {'description': strategy.description, **self.ledgers[name].to_dict()}
+            for name, strategy in self.strategies.items()
+        }
@@ -0,0 +1,146 @@
+"""
+Balayage parallèle des paramètres de prédiction sur un flux archivé.
+
+Chaque configuration est rejouée (voir replay.py) dans un pool de processus
+couvrant tous les cœurs, puis classée par taux de réussite et plus longue
+série de pertes. Paramètres balayés:
+- mode manuel: écarts PAIR/IMPAIR (manual_even_gap / manual_odd_gap)
+- mode auto: taille de fenêtre (games_for_analysis) et bornes des écarts (auto_gap_min/max)
+- dans les deux modes: prediction_window et target_offset
+
+Usage:
+    python sweep.py flux.jsonl --even-gaps 2-8 --odd-gaps 2-8 --windows 20,50,100 \\
+        --prediction-windows 2,3 --offsets 1,2,3
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import engine as defaults
+import replay
+
+DEFAULT_GAMES_FOR_ANALYSIS = defaults.GAMES_FOR_ANALYSIS
+
+_stream = None
+_loop = None
+
+
+def parse_values(text: str) -> list:
+    """'2-5' -> [2, 3, 4, 5], '20,50' -> [20, 50]."""
+    values = []
+    for part in text.split(','):
+        part = part.strip()
+        if '-' in part[1:]:
+            start, end = part.split('-', 1)
+            values.extend(range(int(start), int(end) + 1))
+        elif part:
+            values.append(int(part))
+    return values
+
+
+def build_grid(args) -> list:
+    common = list(itertools.product(args.prediction_windows, args.offsets))
+    grid = []
+
+    if not args.auto_only:
+        for even_gap, odd_gap, (window, offset) in itertools.product(args.even_gaps, args.odd_gaps, common):
+            grid.append({
+                'mode': 'manual', 'even_gap': even_gap, 'odd_gap': odd_gap,
+                'games_for_analysis': DEFAULT_GAMES_FOR_ANALYSIS,
+                'prediction_window': window, 'target_offset': offset,
+            })
+
+    if not args.manual_only:
+        for games, gap_min, gap_max, (window, offset) in itertools.product(
+                args.windows, args.gap_min, args.gap_max, common):
+            if gap_min > gap_max:
+                continue
+            grid.append({
+                'mode': 'auto', 'games_for_analysis': games, 'gap_min': gap_min, 'gap_max': gap_max,
+                'prediction_window': window, 'target_offset': offset,
+            })
+
+    return grid
+
+
+def apply_config(config: dict):
+    engine = replay.replay_engine()
+    engine.auto_mode = config['mode'] == 'auto'
+    engine.set_games_for_analysis(config['games_for_analysis'])
+    if engine.auto_mode:
+        engine.auto_gap_min = config['gap_min']
+        engine.auto_gap_max = config['gap_max']
+    else:
+        engine.manual_even_gap = config['even_gap']
+        engine.manual_odd_gap = config['odd_gap']
+    engine.prediction_window = config['prediction_window']
+    engine.target_offset = config['target_offset']
+
+
+def _init_worker(stream_path: str):
+    global _stream, _loop
+    logging.disable(logging.WARNING)
+    _stream = replay.load_stream(stream_path)
+    _loop = asyncio.new_event_loop()
+
+
+def run_config(config: dict) -> dict:
+    apply_config(config)
+    result = _loop.run_until_complete(replay.replay(_stream))
+    return {'config': config, **result.to_dict()}
+
+
+def rank(results: list) -> list:
+    return sorted(results, key=lambda r: (-r['win_rate'], r['longest_losing_run'], -r['predictions']))
+
+
+def describe(config: dict) -> str:
+    if config['mode'] == 'manual':
+        rule = f"MANUEL P={config['even_gap']} I={config['odd_gap']}"
+    else:
+        rule = f"AUTO fenêtre={config['games_for_analysis']} bornes={config['gap_min']}..{config['gap_max']}"
+    return f"{rule} | fenêtre préd.={config['prediction_window']} | +{config['target_offset']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balayage des paramètres de prédiction")
+    parser.add_argument('stream', help="Fichier JSONL des messages du canal source")
+    parser.add_argument('--even-gaps', type=parse_values, default=parse_values('2-8'))
+    parser.add_argument('--odd-gaps', type=parse_values, default=parse_values('2-8'))
+    parser.add_argument('--windows', type=parse_values, default=[DEFAULT_GAMES_FOR_ANALYSIS],
+                        help="Tailles de fenêtre d'analyse (mode auto)")
+    parser.add_argument('--gap-min', type=parse_values, default=[defaults.AUTO_GAP_MIN])
+    parser.add_argument('--gap-max', type=parse_values, default=[defaults.AUTO_GAP_MAX])
+    parser.add_argument('--prediction-windows', type=parse_values, default=[defaults.PREDICTION_WINDOW])
+    parser.add_argument('--offsets', type=parse_values, default=[defaults.PREDICTION_TARGET_OFFSET])
+    parser.add_argument('--manual-only', action='store_true')
+    parser.add_argument('--auto-only', action='store_true')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', help="Écrit tous les résultats classés dans ce fichier JSON")
+    args = parser.parse_args()
+
+    grid = build_grid(args)
+    print(f"🔬 {len(grid)} configurations sur {args.workers} processus")
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.stream,)) as pool:
+        chunksize = max(1, len(grid) // (args.workers * 4))
+        results = rank(list(pool.map(run_config, grid, chunksize=chunksize)))
+
+    for i, r in enumerate(results[:args.top], 1):
+        print(f"{i:>3}. {r['win_rate']:6.2f}% | ✅{r['won']} ❌{r['lost']} | "
+              f"pertes max: {r['longest_losing_run']} | {describe(r['config'])}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Traces des jeux finalisés à travers le pipeline (réception -> envoi par canal).
+
+Une trace regroupe les étapes (spans) d'un message source; la trace courante
+est portée par une ContextVar, donc suivie jusque dans les tâches créées par
+asyncio.gather (envois par canal). Les traces terminées sont gardées dans un
+tampon circulaire borné, consultable via /debug/traces.
+"""
+
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from time import perf_counter
+
+current_trace = ContextVar('current_trace', default=None)
+
+
+class Trace:
+    __slots__ = ('source', 'game_number', 'started_at', '_t0', 'total_ms', 'spans')
+
+    def __init__(self, source: int = None):
+        self.source = source
+        self.game_number = None
+        self.started_at = datetime.now()
+        self._t0 = perf_counter()
+        self.total_ms = None
+        self.spans = []  # (nom, début ms, durée ms, attributs)
+
+    def finish(self):
+        self.total_ms = (perf_counter() - self._t0) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            'source': self.source,
+            'game_number': self.game_number,
+            'started_at': self.started_at.isoformat(),
+            'total_ms': round(self.total_ms, 3) if self.total_ms is not None else None,
+            'spans': [
+                {'name': name, 'start_ms': round(start, 3), 'duration_ms': round(duration, 3), **attrs}
+                for name, start, duration, attrs in self.spans
+            ],
+        }
+
+
+class span:
+    """Chronomètre une étape de la trace courante (sans effet hors trace)."""
+    __slots__ = ('name', 'attrs', '_trace', '_start')
+
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self._trace = current_trace.get()
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        trace = self._trace
+        if trace is not None:
+            end = perf_counter()
+            trace.spans.append((self.name, (self._start - trace._t0) * 1000,
+                                (end - self._start) * 1000, self.attrs))
+        return False
+
+
+class TraceBuffer:
+    def __init__(self, size: int):
+        self._traces = deque(maxlen=size)
+
+    def add(self, trace: Trace):
+        self._traces.append(trace)
+
+    def clear(self):
+        self._traces.clear()
+
+    def query(self, limit: int = 50, min_ms: float = 0, game_number: int = None, source: int = None) -> list:
+        """Traces les plus récentes d'abord, filtrées par durée totale, numéro de jeu ou source."""
+        result = []
+        for trace in reversed(self._traces):
+            if len(result) >= limit:
+                break
+            if game_number is not None and trace.game_number != game_number:
+                continue
+            if source is not None and trace.source != source:
+                continue
+            if trace.total_ms is not None and trace.total_ms < min_ms:
+                continue
+            result.append(trace.to_dict())
+        return result